@@ -42,23 +42,65 @@ Features:
   • Kivy-based interface mapper (optional)
   • IPython magic extension for AptAn
   • Enhanced ipywidgets UI with logs, progress bars, state mgmt
+
+Requires click, rich and requests. Optional, used when installed:
+  ipywidgets (notebook UI), kivy (GUI), orjson (faster JSON),
+  aiohttp (async downloads), liburing (batched reads),
+  zstandard ("tar_codec": "zstd" source archives; pip install zstandard)
 """
 
-import os
 import sys
-import subprocess
-import tarfile
-import zipfile
-import json
+
+__version__ = "0.4.5"
+
+# Static copy of `yesco --help`; keep in sync when commands are added.
+_YESCO_HELP = """Usage:  [OPTIONS] COMMAND [ARGS]...
+
+  Yesco: Manage projects and build applications.
+
+Options:
+  --help  Show this message and exit.
+
+Commands:
+  compile-and-debug
+  compile-source
+  create-project
+  jedimt-cli
+  package
+  run-simulator
+  setup
+  sign-project
+  stop-simulator"""
+
+# Answer --version/--help before importing click, rich, requests and friends.
+# --yesco/--gui take precedence in main(), so leave those to the full path.
+if __name__ == "__main__" and "--yesco" not in sys.argv and "--gui" not in sys.argv:
+    if "--version" in sys.argv:
+        print(f"Jedimt/Yesco Version: {__version__}")
+        sys.exit(0)
+    if "--help" in sys.argv:
+        print(_YESCO_HELP)
+        sys.exit(0)
+
+import io
+import os
+import logging
 import re
 import threading
 import time
-import requests
 import platform
+import tempfile
 import shutil
-import base64
-import uuid
+import stat
+import errno
 import shlex
+import weakref
+import mmap
+import collections
+import copy
+import contextlib
+import functools
+import importlib.util
 
 try:
     import click
@@ -66,70 +108,221 @@ except ImportError:
     print("Please install click: pip install click")
     sys.exit(1)
 
-try:
-    from rich.console import Console
-    from rich.prompt import Prompt
-    from rich.panel import Panel
-except ImportError:
+# rich, kivy and liburing are only imported when first used; just check
+# they exist.
+if importlib.util.find_spec("rich") is None:
     print("Please install rich: pip install rich")
     sys.exit(1)
 
+kivy_available = importlib.util.find_spec("kivy") is not None
+aiohttp_available = importlib.util.find_spec("aiohttp") is not None
+liburing_available = importlib.util.find_spec("liburing") is not None
+
 try:
-    import kivy
-    from kivy.app import App
-    from kivy.uix.boxlayout import BoxLayout
-    from kivy.uix.filechooser import FileChooserIconView
-    from kivy.uix.textinput import TextInput
-    from kivy.uix.button import Button
-    from kivy.uix.scrollview import ScrollView
-    from kivy.uix.gridlayout import GridLayout
-    from kivy.uix.label import Label
-    from kivy.uix.popup import Popup
+    import orjson
 
-    kivy_available = True
-except ImportError:
-    kivy_available = False
+    def _json_dumpb(obj, indent=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
 
-try:
-    import ipywidgets as widgets
-    from IPython.display import display, HTML, clear_output
-    from IPython.core.magic import (
-        Magics, magics_class, line_magic, cell_magic, line_cell_magic
-    )
-    from IPython.core.magic_arguments import (
-        argument, magic_arguments, parse_argstring
-    )
-    from IPython.core.getipython import get_ipython
-    ipywidgets_available = True
+    _json_loads = orjson.loads
 except ImportError:
-    ipywidgets_available = False
+    # Only the fallback needs the stdlib encoder.
+    import json
+
+    def _json_dumpb(obj, indent=False):
+        return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
 
-console = Console()
+    _json_loads = json.loads
+
+
+def _json_dumps(obj, indent=False):
+    return _json_dumpb(obj, indent).decode("utf-8")
+
+# ipywidgets/IPython are only worth importing inside an IPython session (or
+# when asked for explicitly); plain CLI runs skip them.
+ipywidgets_available = False
+if "IPython" in sys.modules or os.environ.get("APTAN_ENABLE_GUI"):
+    try:
+        import ipywidgets as widgets
+        from IPython.display import display
+        from IPython.core.magic import Magics, magics_class, line_magic
+        from IPython.core.magic_arguments import (
+            argument, magic_arguments, parse_argstring
+        )
+        from IPython.core.getipython import get_ipython
+        ipywidgets_available = True
+    except ImportError:
+        pass
+
+if not ipywidgets_available:
+    def get_ipython():
+        return None
+
+# Same tag shape rich's markup parser accepts: [red], [/red], [bold blue], [/].
+_RICH_MARKUP_RE = re.compile(r"\[[a-z#/@][^\[]*?\]")
+
+
+class _PlainConsole:
+    """
+    Minimal console for dumb terminals, pipes and NO_COLOR: strips markup and
+    prints. Non-string renderables (Panels) still go through rich.
+    """
+    def __init__(self):
+        self._rich = None
+
+    def log(self, *objects, **kwargs):
+        self.print(*objects, **kwargs)
+
+    def print(self, *objects, **kwargs):
+        if all(isinstance(o, str) for o in objects):
+            if kwargs.get("markup", True):
+                objects = [_RICH_MARKUP_RE.sub("", o) for o in objects]
+            print(*objects)
+            return
+        if self._rich is None:
+            from rich.console import Console
+            self._rich = Console()
+        self._rich.print(*objects, **kwargs)
+
+
+# Set on a widget job's worker thread: `output` is the pane its prints go to,
+# `confirm` answers y/n questions through that pane instead of stdin.
+_job_context = threading.local()
+
+
+class _JobStream:
+    """
+    sys.stdout/sys.stderr stand-in: writes from a widget job's thread land
+    in that job's output pane, everything else in the wrapped stream.
+    """
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        output = getattr(_job_context, "output", None)
+        if output is None:
+            return self._stream.write(text)
+        output.append_stdout(text)
+        return len(text)
+
+    def flush(self):
+        if getattr(_job_context, "output", None) is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _LazyConsole:
+    """Stand-in for rich's Console that defers importing rich until first use."""
+    def __init__(self):
+        self._console = None
+        self._job_console = None
+
+    def __getattr__(self, name):
+        if getattr(_job_context, "output", None) is not None:
+            # Widget jobs get plain lines, printed into their own pane.
+            if self._job_console is None:
+                self._job_console = _PlainConsole()
+            return getattr(self._job_console, name)
+        if self._console is None:
+            # ipykernel's stdout is not a TTY, but notebooks render rich fine.
+            piped = not sys.stdout.isatty() and "ipykernel" not in sys.modules
+            if os.environ.get("NO_COLOR") or os.environ.get("TERM") == "dumb" or piped:
+                self._console = _PlainConsole()
+            else:
+                from rich.console import Console
+                self._console = Console()
+        return getattr(self._console, name)
+
+
+console = _LazyConsole()
+
+# AptAn's progress messages. Bare lines on stdout by default, as before;
+# batch callers can raise the level to WARNING and skip the formatting.
+logger = logging.getLogger("aptan")
+if not logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# Read once; every Jedimt/AptAn built from the environment shares it.
+_GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 
 config = {
     "enable_debugging": True
 }
-__version__ = "0.4.5"
+
+# Characters that need /bin/sh: pipes, redirects, globs, variables, grouping,
+# comments.
+_SHELL_METACHARS = frozenset("|&;<>()$`*?[]~{}#\n")
+# Commands with no executable to run; they only exist inside a shell.
+_SHELL_BUILTINS = frozenset((
+    ".", ":", "alias", "bg", "cd", "command", "declare", "eval", "exec",
+    "exit", "export", "fg", "hash", "jobs", "local", "popd", "pushd",
+    "readonly", "set", "shift", "source", "trap", "type", "ulimit", "umask",
+    "unalias", "unset", "wait",
+))
+
+
+def _run_command(cmd, shell_executable=None, **kwargs):
+    """
+    Run a command line directly as an argv when it is plain words; lines that
+    use shell syntax still go through the shell (`shell_executable` if set).
+    """
+    import subprocess
+    if _SHELL_METACHARS.isdisjoint(cmd):
+        try:
+            argv = shlex.split(cmd)
+        except ValueError:
+            # Unbalanced quotes: let the shell report it as it always did.
+            argv = None
+        # `FOO=1 make` and builtins like `cd` need the shell as well.
+        if argv and "=" not in argv[0] and argv[0] not in _SHELL_BUILTINS:
+            return subprocess.run(argv, **kwargs)
+    return subprocess.run(cmd, shell=True, executable=shell_executable, **kwargs)
+
+
+def _codesign(app_path, identity):
+    """
+    Sign `app_path` with `identity`; shared by the CLI and the widget.
+    Returns (returncode, stderr). Raises OSError when codesign is missing.
+    """
+    import subprocess
+    res = subprocess.run(
+        ["codesign", "-s", identity, app_path],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, errors="replace"
+    )
+    return res.returncode, res.stderr.strip()
+
 
 # -----------------------------------------------------------------------------
 # 1) PlatformConfig
 # -----------------------------------------------------------------------------
+_PLATFORM_CONFIG_FILE = "platform_config.json"
+
+
 class PlatformConfig:
     def __init__(self):
         self.system = platform.system()
         self.release = platform.release()
         self.version = platform.version()
         self.machine = platform.machine()
-        self.processor = platform.processor()
+        self.is_linux = self.system == "Linux"
+        self.is_darwin = self.system == "Darwin"
+        self.is_windows = self.system == "Windows"
         self.home_dir = os.path.expanduser("~")
         self.config = self.load_config()
 
     def load_config(self):
-        config_file = "platform_config.json"
+        config_file = _PLATFORM_CONFIG_FILE
         try:
-            with open(config_file, "r") as f:
-                data = json.load(f)
-                return data.get(self.system, {})
+            mtime_ns = os.stat(config_file).st_mtime_ns
+            data = _parse_platform_config(os.path.abspath(config_file), mtime_ns)
+            # The parsed file is cached and shared; each instance gets its own copy.
+            return copy.deepcopy(data.get(self.system, {}))
         except FileNotFoundError:
             print(f"Warning: '{config_file}' not found. Using defaults.")
             return {}
@@ -137,6 +330,12 @@ class PlatformConfig:
     def get_config(self, key, default=None):
         return self.config.get(key, default)
 
+    @functools.cached_property
+    def processor(self):
+        # platform.processor() forks `uname -p` on POSIX; only pay for it
+        # when someone actually asks.
+        return platform.processor()
+
     def print_platform_info(self):
         print("Platform Information:")
         print(f"  System: {self.system}")
@@ -148,59 +347,101 @@ class PlatformConfig:
         print(f"  Config: {self.config}")
 
 
+@functools.lru_cache(maxsize=8)
+def _parse_platform_config(path, mtime_ns):
+    # Keyed on mtime so an edited file is re-read; unchanged ones never are.
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+
+def get_platform_config():
+    """
+    Process-wide PlatformConfig shared by the magics, Jedimt and the GUI;
+    rebuilt when the config file (as seen from the current directory) changes.
+    """
+    try:
+        mtime_ns = os.stat(_PLATFORM_CONFIG_FILE).st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+    return _platform_config_for(os.path.abspath(_PLATFORM_CONFIG_FILE), mtime_ns)
+
+
+@functools.lru_cache(maxsize=1)
+def _platform_config_for(path, mtime_ns):
+    return PlatformConfig()
+
+
 # -----------------------------------------------------------------------------
 # 2) Gemini (Simulated)
 # -----------------------------------------------------------------------------
+# Simulated translations: the prompt is indented into {body}.
+_GEMINI_TEMPLATES = {
+    "python": (
+        "def main():\n"
+        "    # Translated code (Python)\n"
+        "{body}\n"
+        "    print('Running on {system}')\n\n"
+        "if __name__ == '__main__':\n"
+        "    main()\n"
+    ),
+    "javascript": (
+        "function main() {{\n"
+        "    // Translated code (JavaScript)\n"
+        "{body}\n"
+        "    console.log('Running on {system}');\n"
+        "}}\n"
+        "main();\n"
+    ),
+    "swift": (
+        "func main() {{\n"
+        "    // Translated code (Swift)\n"
+        "{body}\n"
+        "    print(\"Running on {system}\")\n"
+        "}}\nmain()\n"
+    ),
+}
+
+
+@functools.lru_cache(maxsize=256)
+def _render_template(prompt, target_language, system_label):
+    """Render one simulated translation; pure, so repeat requests are cached."""
+    template = _GEMINI_TEMPLATES.get(target_language)
+    if template is None:
+        return f"// Not supported: {target_language}"
+    # Same line splitting as the original string building (CRLF, trailing
+    # blank lines and empty prompts included).
+    body = "    " + "\n    ".join(prompt.splitlines())
+    return template.format(body=body, system=system_label)
+
+
+def _confirm(question):
+    """Ask a y/n question; widget jobs answer it in their pane, not on stdin."""
+    ask = getattr(_job_context, "confirm", None)
+    if ask is not None:
+        return ask(question)
+    return input(f"{question} (y/n): ").lower() == 'y'
+
+
 class Gemini:
     def __init__(self, api_key, platform_config):
         self.api_key = api_key
         self.platform_config = platform_config
+        self.system_label = platform_config.system
         print("Gemini initialized with API key.")
 
     def generate_code(self, prompt, target_language="python", temperature=0.7, max_output_tokens=8000):
         print(f"Simulating translation to {target_language} with Gemini...\n")
-        system_label = self.platform_config.system
-
-        if target_language == "python":
-            result = (
-                "def main():\n"
-                "    # Translated code (Python)\n"
-                + "    " + "\n    ".join(prompt.splitlines()) +
-                f"\n    print('Running on {system_label}')\n\n"
-                "if __name__ == '__main__':\n"
-                "    main()\n"
-            )
-        elif target_language == "javascript":
-            result = (
-                "function main() {\n"
-                "    // Translated code (JavaScript)\n"
-                + "    " + "\n    ".join(prompt.splitlines()) +
-                f"\n    console.log('Running on {system_label}');\n"
-                "}\n"
-                "main();\n"
-            )
-        elif target_language == "swift":
-            result = (
-                "func main() {\n"
-                "    // Translated code (Swift)\n"
-                + "    " + "\n    ".join(prompt.splitlines()) +
-                f"\n    print(\"Running on {system_label}\")\n"
-                "}\nmain()\n"
-            )
-        else:
-            result = f"// Not supported: {target_language}"
-
-        return result
+        return _render_template(prompt, target_language, self.system_label)
 
     def analyze_suitability(self, source_code, package_name):
         print("Simulating Gemini analysis...\n")
         if "network" in package_name.lower():
             print(f"Warning: '{package_name}' is networking. Consider built-in libs.")
-            if input("Continue anyway? (y/n): ").lower() != 'y':
+            if not _confirm("Continue anyway?"):
                 return False
         if "system" in source_code:
             print("Warning: potential sandbox issues.")
-            if input("Continue with Python translation? (y/n): ").lower() != 'y':
+            if not _confirm("Continue with Python translation?"):
                 return False
         return True
 
@@ -214,6 +455,85 @@ class Gemini:
 # -----------------------------------------------------------------------------
 # 3) AptAn
 # -----------------------------------------------------------------------------
+# copy_file_range errors that just mean "not here": cross-device on older
+# kernels, unsupported filesystems, or no syscall at all.
+_COPY_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+
+
+def _copy_file_fast(src, dst):
+    """
+    Copy `src` to `dst` in-kernel with copy_file_range (reflinks on XFS/Btrfs),
+    falling back to shutil.copyfile (sendfile on Linux). Mode and times are
+    applied once afterwards instead of through copystat.
+    """
+    st = os.stat(src)
+    copied = False
+    if hasattr(os, "copy_file_range"):
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            try:
+                remaining = st.st_size
+                while remaining > 0:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if not n:
+                        break
+                    remaining -= n
+                copied = True
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+    if not copied:
+        shutil.copyfile(src, dst)
+    os.chmod(dst, stat.S_IMODE(st.st_mode))
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _fast_copytree(src, dst):
+    """Merge the contents of `src` into `dst`, like copytree(dirs_exist_ok=True)."""
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(src) as it:
+        for entry in it:
+            target = os.path.join(dst, entry.name)
+            if entry.is_dir():
+                _fast_copytree(entry.path, target)
+                shutil.copystat(entry.path, target)
+            else:
+                _copy_file_fast(entry.path, target)
+
+
+def _read_source_text(path):
+    """Read a source file as text, reusing the last read while it is unchanged."""
+    st = os.stat(path)
+    # mtime alone is not enough: tar restores it on re-extraction. A new
+    # inode, size or ctime (which tar cannot set) marks a different file.
+    key = (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+    return _read_source_text_cached(os.path.abspath(path), key)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_source_text_cached(path, stat_key):
+    with open(path, "r") as f:
+        return f.read()
+
+
+# Install dirs known to be exported from ~/.bashrc in this process.
+_BASHRC_LOCK = threading.Lock()
+_bashrc_paths = set()
+
+# Held around Gemini's interactive suitability check.
+_SUITABILITY_LOCK = threading.Lock()
+
+# At most this many source downloads in flight at once, so bulk installs
+# don't hammer a mirror; streamed to disk in 1 MiB pieces.
+_DOWNLOAD_SLOTS = threading.Semaphore(8)
+_DOWNLOAD_CHUNK = 1024 * 1024
+# (connect, read) seconds for every HTTP request a download makes.
+_HTTP_TIMEOUT = (5, 30)
+# Files at least this big are fetched as parallel byte ranges when the
+# server allows it.
+_RANGE_MIN_SIZE = 8 * 1024 * 1024
+_RANGE_PARTS = 4
+
+
 class AptAn:
     def __init__(self, platform_config, gemini_api_key=None):
         self.platform_config = platform_config
@@ -222,105 +542,407 @@ class AptAn:
         self.install_dir = os.path.join(platform_config.home_dir, ".aptan", "installed")
         os.makedirs(self.source_dir, exist_ok=True)
         os.makedirs(self.install_dir, exist_ok=True)
+        self._pool = None
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._prefetched = {}
+        self._db = None
+        self._db_lock = threading.Lock()
+        self.download_chunk_size = platform_config.get_config(
+            "download_chunk_size", _DOWNLOAD_CHUNK
+        )
+
+    def _get_pool(self):
+        if self._pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._pool = ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2)
+        return self._pool
+
+    def close(self):
+        """Release the HTTP session, worker pool and install index."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _get_db(self):
+        # Central install index; callers hold _db_lock since installs run on
+        # pool threads.
+        if self._db is None:
+            import sqlite3
+            db = sqlite3.connect(
+                os.path.join(self.install_dir, "index.sqlite"),
+                check_same_thread=False, isolation_level=None
+            )
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS installs ("
+                "package_name TEXT PRIMARY KEY, install_time REAL, "
+                "platform TEXT, install_path TEXT)"
+            )
+            self._db = db
+        return self._db
+
+    def _record_installs(self, rows):
+        """Upsert (package_name, install_time, platform, install_path) rows."""
+        with self._db_lock:
+            db = self._get_db()
+            db.execute("BEGIN")
+            try:
+                db.executemany("INSERT OR REPLACE INTO installs VALUES (?,?,?,?)", rows)
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def list_installed(self):
+        """Return (package_name, install_time, platform, install_path) rows."""
+        with self._db_lock:
+            return self._get_db().execute(
+                "SELECT * FROM installs ORDER BY package_name"
+            ).fetchall()
 
     def download_source(self, package_name, source_url):
+        import requests
+        import subprocess
         if source_url is None:
             source_url = ""
         try:
-            if self.platform_config.system == "Linux" and shutil.which("apt-get"):
+            if self._uses_apt_source():
                 cmd = ["apt-get", "source", package_name]
                 temp_dir = os.path.join(self.source_dir, f"temp_{package_name}")
                 os.makedirs(temp_dir, exist_ok=True)
 
-                print(f"Downloading '{package_name}' via apt-get source...")
+                logger.info("Downloading '%s' via apt-get source...", package_name)
                 subprocess.run(cmd, cwd=temp_dir, check=True)
 
-                extracted = [
-                    d for d in os.listdir(temp_dir)
-                    if os.path.isdir(os.path.join(temp_dir, d))
-                ]
+                with os.scandir(temp_dir) as it:
+                    extracted = [e.name for e in it if e.is_dir()]
                 if not extracted:
                     raise FileNotFoundError("apt-get source produced no folder.")
                 return os.path.join(temp_dir, extracted[0])
             else:
                 if not source_url:
-                    print("No source URL provided.")
+                    logger.warning("No source URL provided.")
                     return None
-                print(f"Downloading '{package_name}' from URL: {source_url}")
-                response = requests.get(source_url, stream=True)
-                response.raise_for_status()
-
-                local_tar = os.path.join(self.source_dir, f"{package_name}.tar.gz")
-                with open(local_tar, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-
+                local_tar = self._download_tarball(package_name, source_url)
                 extract_dir = os.path.join(self.source_dir, package_name)
-                with tarfile.open(local_tar, "r:gz") as tar:
-                    tar.extractall(extract_dir)
+                _extract_tar_stream(local_tar, extract_dir)
                 return extract_dir
 
         except (requests.exceptions.RequestException, subprocess.CalledProcessError, FileNotFoundError) as e:
-            print(f"Error: {e}")
+            logger.error("Error: %s", e)
             return None
 
+    def _download_tarball(self, package_name, source_url):
+        """Fetch (or reuse the prefetched) source tarball; returns its path."""
+        local_tar = self._prefetched.pop(package_name, None)
+        if local_tar is None:
+            logger.info("Downloading '%s' from URL: %s", package_name, source_url)
+            local_tar = os.path.join(self.source_dir, f"{package_name}.tar.gz")
+            with _DOWNLOAD_SLOTS:
+                self._fetch(source_url, local_tar)
+        return local_tar
+
+    def _uses_apt_source(self):
+        return self._has_apt_get
+
+    @functools.cached_property
+    def _ipython(self):
+        # The shell a manager runs under does not change; resolve it once.
+        return get_ipython()
+
+    @functools.cached_property
+    def _has_apt_get(self):
+        # Looked up once per manager, not by walking $PATH on every install.
+        return self.platform_config.is_linux and bool(shutil.which("apt-get"))
+
+    def prefetch_sources(self, packages):
+        """
+        Download every (package_name, source_url) tarball concurrently on one
+        asyncio loop with aiohttp. download_source then reuses these files;
+        anything that failed here is simply fetched again there.
+        """
+        import asyncio
+        import aiohttp
+
+        async def fetch_one(session, slots, name, url):
+            local_tar = os.path.join(self.source_dir, f"{name}.tar.gz")
+            async with slots:
+                logger.info("Downloading '%s' from URL: %s", name, url)
+                try:
+                    async with session.get(url) as response:
+                        response.raise_for_status()
+                        with open(local_tar, "wb") as f:
+                            async for chunk in response.content.iter_chunked(self.download_chunk_size):
+                                f.write(chunk)
+                except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                    logger.error("Prefetch failed for '%s': %s", name, e)
+                    return
+            self._prefetched[name] = local_tar
+
+        async def fetch_all():
+            slots = asyncio.Semaphore(8)
+            async with aiohttp.ClientSession() as session:
+                await asyncio.gather(*(fetch_one(session, slots, n, u) for n, u in packages))
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(fetch_all())
+            return
+        # Inside a running loop (e.g. a notebook kernel): use a helper thread.
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(asyncio.run, fetch_all()).result()
+
+    def _get_session(self):
+        # requests is imported on first download, not at module import.
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from urllib3.util.retry import Retry
+                self._session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=20, pool_maxsize=40,
+                    max_retries=Retry(total=3, backoff_factor=0.3)
+                )
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+            return self._session
+
+    def _fetch(self, url, local_path):
+        session = self._get_session()
+        # No separate HEAD: the streamed GET's headers tell whether a large
+        # file can be split into ranges. If it can, the body is left unread.
+        with session.get(url, stream=True, timeout=_HTTP_TIMEOUT) as response:
+            response.raise_for_status()
+            size = int(response.headers.get("Content-Length") or 0)
+            if (size >= _RANGE_MIN_SIZE
+                    and response.headers.get("Accept-Ranges") == "bytes"
+                    and "Content-Encoding" not in response.headers
+                    and self._fetch_ranges(response.url, local_path, size)):
+                return
+            response.raw.decode_content = True
+            with open(local_path, "wb") as f:
+                shutil.copyfileobj(response.raw, f, self.download_chunk_size)
+
+    def _fetch_ranges(self, url, local_path, size):
+        # Returns False when the server ignores or refuses a Range request,
+        # so the caller falls back to a single stream.
+        import requests
+        step = -(-size // _RANGE_PARTS)
+        bounds = [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+        buf = mmap.mmap(-1, size)
+        try:
+            def fetch_part(bound):
+                start, end = bound
+                try:
+                    part = self._get_session().get(
+                        url, headers={"Range": f"bytes={start}-{end}"}, timeout=_HTTP_TIMEOUT
+                    )
+                except requests.exceptions.RequestException:
+                    return False
+                # Anything but 206 (200, 403, 416, ...) means no ranges here.
+                if part.status_code != 206 or len(part.content) != end - start + 1:
+                    return False
+                buf[start:end + 1] = part.content
+                return True
+
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=_RANGE_PARTS) as executor:
+                if not all(executor.map(fetch_part, bounds)):
+                    return False
+            with open(local_path, "wb") as f:
+                f.write(buf)
+            return True
+        finally:
+            buf.close()
+
     def convert_to_targz(self, source_path, package_name):
+        """
+        Pack `source_path` into the sources dir. gzip by default (through
+        pigz when installed); "tar_codec": "zstd" in the platform config
+        writes a multithreaded .tar.zst instead when zstandard is available.
+        """
+        import subprocess
+        import tarfile
+        if (self.platform_config.get_config("tar_codec", "gzip") == "zstd"
+                and importlib.util.find_spec("zstandard")):
+            import zstandard
+            tar_file = os.path.join(self.source_dir, f"{package_name}.tar.zst")
+            logger.info("Creating tar.zst: %s", tar_file)
+            try:
+                compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+                with open(tar_file, "wb") as out, \
+                        compressor.stream_writer(out, closefd=False) as zout, \
+                        tarfile.open(fileobj=zout, mode="w|") as tar:
+                    self._pack_tree(tar, source_path)
+                return tar_file
+            except Exception as e:
+                logger.error("Failed: %s", e)
+                return None
+
         tar_file = os.path.join(self.source_dir, f"{package_name}.tar.gz")
-        print(f"Creating tar.gz: {tar_file}")
+        logger.info("Creating tar.gz: %s", tar_file)
         try:
-            with tarfile.open(tar_file, "w:gz") as tar:
-                for root, dirs, files in os.walk(source_path):
-                    for file in files:
-                        fullp = os.path.join(root, file)
-                        relp = os.path.relpath(fullp, source_path)
-                        tar.add(fullp, arcname=relp)
+            pigz = shutil.which("pigz")
+            if pigz:
+                # Parallel deflate: stream an uncompressed tar into pigz.
+                with open(tar_file, "wb") as out:
+                    proc = subprocess.Popen(
+                        [pigz, "-p", str(os.cpu_count() or 1), "-c"],
+                        stdin=subprocess.PIPE, stdout=out
+                    )
+                    try:
+                        with tarfile.open(fileobj=proc.stdin, mode="w|") as tar:
+                            self._pack_tree(tar, source_path)
+                    finally:
+                        proc.stdin.close()
+                        proc.wait()
+                if proc.returncode:
+                    raise subprocess.CalledProcessError(proc.returncode, pigz)
+            else:
+                with tarfile.open(tar_file, "w:gz") as tar:
+                    self._pack_tree(tar, source_path)
             return tar_file
         except Exception as e:
-            print(f"Failed: {e}")
+            logger.error("Failed: %s", e)
             return None
 
+    def _pack_tree(self, tar, source_path):
+        source_path = source_path.rstrip(os.sep) or os.sep
+        prefix_len = len(source_path) + (source_path != os.sep)
+        for root, dirs, files in os.walk(source_path):
+            # Sorted walk: the archive layout does not depend on readdir order.
+            dirs.sort()
+            # os.walk joins onto source_path, so slicing yields the relative dir.
+            rel_root = root[prefix_len:]
+            for file in sorted(files):
+                fullp = root + os.sep + file
+                arcname = rel_root + os.sep + file if rel_root else file
+                info = tar.gettarinfo(fullp, arcname)
+                if info is None:
+                    logger.warning("Skipping %s: unsupported file type.", fullp)
+                elif info.isreg():
+                    with open(fullp, "rb") as f:
+                        tar.addfile(info, f)
+                else:
+                    tar.addfile(info)
+
     def build_native(self, extract_dir, package_name):
+        import subprocess
         makefile = os.path.join(extract_dir, "Makefile")
         if not os.path.exists(makefile):
-            print(f"No Makefile in {extract_dir}. Skipping native build.")
+            logger.warning("No Makefile in %s. Skipping native build.", extract_dir)
             return False
         build_cmd = self.platform_config.get_config("build_command", "make")
         try:
-            subprocess.run(f"cd {extract_dir} && {build_cmd}", shell=True, check=True)
-            print(f"'{package_name}' built successfully (native).")
+            _run_command(build_cmd, cwd=extract_dir, check=True)
+            logger.info("'%s' built successfully (native).", package_name)
             return True
-        except subprocess.CalledProcessError as e:
-            print(f"Build error: {e}")
+        except (subprocess.CalledProcessError, OSError) as e:
+            logger.error("Build error: %s", e)
             return False
 
+    def build_native_batch(self, builds):
+        """
+        Build several extracted packages, given as (package_name, dir) pairs,
+        with a single make process. A generated top-level Makefile recurses
+        into each directory so make's jobserver schedules all of them
+        together; returns {dir: success}.
+        """
+        import subprocess
+        results = {}
+        buildable = []
+        names = {}
+        for name, d in builds:
+            names[d] = name
+            if os.path.exists(os.path.join(d, "Makefile")):
+                buildable.append(d)
+            else:
+                logger.warning("No Makefile in %s. Skipping native build.", d)
+                results[d] = False
+        if not buildable:
+            return results
+        build_cmd = self.platform_config.get_config("build_command", "make")
+        if build_cmd != "make" or len(buildable) == 1:
+            for d in buildable:
+                results[d] = self.build_native(d, names[d])
+            return results
+
+        with tempfile.TemporaryDirectory() as tmp:
+            failed_log = os.path.join(tmp, "failed")
+            targets = [f"build-{i}" for i in range(len(buildable))]
+            lines = [f"all: {' '.join(targets)}", ".PHONY: all " + " ".join(targets)]
+            for target, d in zip(targets, buildable):
+                # A failed sub-make is recorded rather than aborting the rest.
+                lines.append(
+                    f"{target}:\n\t@$(MAKE) -C {shlex.quote(d)} || "
+                    f"echo {shlex.quote(d)} >> {shlex.quote(failed_log)}"
+                )
+            makefile = os.path.join(tmp, "Makefile")
+            with open(makefile, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            try:
+                subprocess.run(
+                    ["make", "-f", makefile, "-j", str(os.cpu_count() or 1), "all"],
+                    check=True
+                )
+            except (subprocess.CalledProcessError, OSError) as e:
+                logger.error("Build error: %s", e)
+                results.update(dict.fromkeys(buildable, False))
+                return results
+            failed = set()
+            if os.path.exists(failed_log):
+                with open(failed_log) as f:
+                    failed = set(f.read().splitlines())
+
+        for d in buildable:
+            ok = d not in failed
+            results[d] = ok
+            if ok:
+                logger.info("'%s' built successfully (native).", names[d])
+            else:
+                logger.error("Build error: make failed for '%s' in %s", names[d], d)
+        return results
+
     def translate_to_language(self, extract_dir, package_name, target_language):
         if not self.gemini:
-            print("Gemini not configured.")
+            logger.warning("Gemini not configured.")
             return False
 
         main_c = os.path.join(extract_dir, "main.c")
         if not os.path.exists(main_c):
-            print("No main.c to translate.")
+            logger.warning("No main.c to translate.")
             return False
 
-        with open(main_c, "r") as f:
-            source_code = f.read()
+        source_code = _read_source_text(main_c)
 
         translated = self.gemini.generate_code(source_code, target_language)
         if not translated:
-            print("Translation failed.")
+            logger.error("Translation failed.")
             return False
 
         out_file = os.path.join(extract_dir, f"{package_name}.{target_language}")
         with open(out_file, "w") as f:
             f.write(translated)
 
-        print(f"Translated '{package_name}' -> {out_file} ({target_language})")
+        logger.info("Translated '%s' -> %s (%s)", package_name, out_file, target_language)
         return True
 
     def build_ios_app(self, extract_dir, package_name):
-        if self.platform_config.system != "Darwin":
-            print("iOS build requires macOS.")
+        import subprocess
+        if not self.platform_config.is_darwin:
+            logger.warning("iOS build requires macOS.")
             return False
 
         proj_files = [f for f in os.listdir(extract_dir) if f.endswith(".xcodeproj")]
@@ -362,114 +984,210 @@ struct ContentView: View {{
             "build"
         ]
         try:
-            print(f"Running iOS build: {' '.join(build_cmd)}")
+            logger.info("Running iOS build: %s", ' '.join(build_cmd))
             subprocess.run(build_cmd, check=True)
-            print(f"iOS app '{package_name}' built.")
+            logger.info("iOS app '%s' built.", package_name)
             return True
         except subprocess.CalledProcessError as e:
-            print(f"iOS build failed: {e}")
+            logger.error("iOS build failed: %s", e)
             return False
 
-    def install_and_configure(self, extract_dir, package_name, install_env=None):
+    def install_and_configure(self, extract_dir, package_name, install_env=None, record=True):
+        """
+        Copy a built tree into place and return its index row. With
+        record=False the row is left for the caller to write together with
+        the rest of a batch, in one transaction.
+        """
         if install_env:
             install_path = os.path.join(self.install_dir, "envs", install_env)
-            print(f"Installing '{package_name}' to environment: {install_path}")
+            logger.info("Installing '%s' to environment: %s", package_name, install_path)
         else:
-            if self.platform_config.system == "Linux":
+            if self.platform_config.is_linux:
                 install_path = "/usr/local/lib"
-            elif self.platform_config.system == "Windows":
+            elif self.platform_config.is_windows:
                 install_path = f"C:\\Program Files\\{package_name}"
             else:
                 install_path = "/usr/local/lib"
-            print(f"Installing '{package_name}' to: {install_path}")
-
-        os.makedirs(install_path, exist_ok=True)
-        for item in os.listdir(extract_dir):
-            src = os.path.join(extract_dir, item)
-            dst = os.path.join(install_path, item)
-            if os.path.isdir(src):
-                shutil.copytree(src, dst, dirs_exist_ok=True)
-            else:
-                shutil.copy2(src, dst)
+            logger.info("Installing '%s' to: %s", package_name, install_path)
+
+        _fast_copytree(extract_dir, install_path)
+
+        row = (package_name, time.time(), self.platform_config.system, install_path)
+        if record:
+            self._record_installs([row])
+        # Per-package JSON manifests predate the index; kept unless disabled.
+        if self.platform_config.get_config("write_config_json", True):
+            conf_file = os.path.join(install_path, f"{package_name}_config.json")
+            data = {
+                "package_name": package_name,
+                "install_time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "platform": self.platform_config.system
+            }
+            _write_chunks(conf_file, [_json_dumpb(data, indent=True)])
 
-        conf_file = os.path.join(install_path, f"{package_name}_config.json")
-        data = {
-            "package_name": package_name,
-            "install_time": time.strftime("%Y-%m-%d %H:%M:%S"),
-            "platform": self.platform_config.system
-        }
-        with open(conf_file, "w") as f:
-            json.dump(data, f, indent=4)
+        if self.platform_config.is_linux:
+            self._add_to_path(install_path, package_name)
 
-        if self.platform_config.system == "Linux":
-            bashrc = os.path.join(self.platform_config.home_dir, ".bashrc")
-            with open(bashrc, "a") as brc:
-                brc.write(f"\n# AptAn for {package_name}\n")
-                brc.write(f"export PATH=\"{install_path}:$PATH\"\n")
-            print(f"PATH updated in '{bashrc}'.")
+        logger.info("Installation complete for '%s'.", package_name)
+        return row
 
-        print(f"Installation complete for '{package_name}'.")
+    def _add_to_path(self, install_path, package_name):
+        # Append an export to ~/.bashrc unless that directory is already on
+        # it; installs into a shared env would otherwise stack duplicates.
+        bashrc = os.path.join(self.platform_config.home_dir, ".bashrc")
+        export = f"export PATH=\"{install_path}:$PATH\"\n"
+        with _BASHRC_LOCK:
+            if install_path in _bashrc_paths:
+                return
+            try:
+                with open(bashrc, "rb") as f:
+                    if os.fstat(f.fileno()).st_size:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            present = mm.find(export.encode()) != -1
+                    else:
+                        present = False
+            except FileNotFoundError:
+                present = False
+            if not present:
+                with open(bashrc, "a") as brc:
+                    brc.write(f"\n# AptAn for {package_name}\n")
+                    brc.write(export)
+                logger.info("PATH updated in '%s'.", bashrc)
+            _bashrc_paths.add(install_path)
+
+    def install_packages(self, packages, target_platform, install_env=None):
+        """
+        Install several packages concurrently. `packages` is an iterable of
+        (package_name, source_url) pairs; returns {package_name: success}.
+        Downloads and extraction release the GIL, so threads overlap them;
+        with aiohttp installed, URL sources are all fetched up front on one
+        event loop instead.
+        """
+        packages = list(packages)
+        if aiohttp_available and not self._uses_apt_source():
+            self.prefetch_sources([(name, url) for name, url in packages if url])
+        if target_platform == "native" and len(packages) > 1:
+            return self._install_native_batch(packages, install_env)
+        pool = self._get_pool()
+        rows = []
+        futures = {
+            name: pool.submit(self._install_one, name, url, target_platform, install_env, rows)
+            for name, url in packages
+        }
+        results = {name: future.result() for name, future in futures.items()}
+        if rows:
+            self._record_installs(rows)
+        return results
+
+    def _install_native_batch(self, packages, install_env):
+        """Fetch and extract concurrently, then build everything with one make."""
+        pool = self._get_pool()
+        futures = {
+            name: pool.submit(self._prepare_package, name, url)
+            for name, url in packages
+        }
+        extracted = {name: future.result() for name, future in futures.items()}
+        built = self.build_native_batch([(name, d) for name, d in extracted.items() if d])
+        results = {}
+        rows = []
+        for name, d in extracted.items():
+            results[name] = bool(d) and built.get(d, False)
+            if results[name]:
+                rows.append(self.install_and_configure(d, name, install_env, record=False))
+        if rows:
+            self._record_installs(rows)
+        return results
+
+    def _prepare_package(self, package_name, source_url):
+        """Fetch a package's source tree; returns the directory to build in."""
+        if source_url and not self._uses_apt_source():
+            # A URL source already is a tarball: extract it once, directly,
+            # rather than unpacking, repacking and unpacking it again.
+            import requests
+            try:
+                tarred = self._download_tarball(package_name, source_url)
+            except (requests.exceptions.RequestException, FileNotFoundError) as e:
+                logger.error("Error: %s", e)
+                return None
 
-    def install_package(self, package_name, source_url, target_platform, install_env=None):
-        src_dir = self.download_source(package_name, source_url)
-        if not src_dir:
-            return False
+            extracted = os.path.join(self.source_dir, package_name + "_extracted")
+            if os.path.exists(extracted):
+                shutil.rmtree(extracted)
+            os.makedirs(extracted, exist_ok=True)
 
-        tarred = self.convert_to_targz(src_dir, package_name)
-        if not tarred:
-            return False
+            try:
+                _extract_tar_stream(tarred, extracted)
+            except Exception as e:
+                logger.error("Extraction error: %s", e)
+                return None
+        else:
+            # apt-get source leaves an unpacked tree on disk; build it where
+            # it is. convert_to_targz is only for producing a distributable.
+            extracted = self.download_source(package_name, source_url)
+            if not extracted:
+                return None
 
-        extracted = os.path.join(self.source_dir, package_name + "_extracted")
-        if os.path.exists(extracted):
-            shutil.rmtree(extracted)
-        os.makedirs(extracted, exist_ok=True)
+        main_c = os.path.join(extracted, "main.c")
+        if os.path.exists(main_c) and self.gemini:
+            code = _read_source_text(main_c)
+            # Packages are prepared concurrently; one question at a time so
+            # prompts and answers cannot interleave.
+            with _SUITABILITY_LOCK:
+                if not self.gemini.analyze_suitability(code, package_name):
+                    self.gemini.suggest_alternatives(package_name)
+                    return None
+        return extracted
 
-        try:
-            with tarfile.open(tarred, "r:gz") as tar:
-                tar.extractall(extracted)
-        except Exception as e:
-            print(f"Extraction error: {e}")
+    def install_package(self, package_name, source_url, target_platform, install_env=None):
+        rows = []
+        ok = self._install_one(package_name, source_url, target_platform, install_env, rows)
+        if rows:
+            self._record_installs(rows)
+        return ok
+
+    def _install_one(self, package_name, source_url, target_platform, install_env, rows):
+        """install_package minus the index write: its row is appended to `rows`."""
+        extracted = self._prepare_package(package_name, source_url)
+        if not extracted:
             return False
-
         main_c = os.path.join(extracted, "main.c")
-        if os.path.exists(main_c) and self.gemini:
-            with open(main_c, "r") as f:
-                code = f.read()
-            if not self.gemini.analyze_suitability(code, package_name):
-                self.gemini.suggest_alternatives(package_name)
-                return False
 
         # Decide how to build or translate
         if target_platform == "python" and self.gemini:
-            with open(main_c, "r") as f:
-                code = f.read()
-            ipy = get_ipython()
+            code = _read_source_text(main_c)
+            ipy = self._ipython
             if ipy:
                 py_code = self.gemini.generate_code(code, "python")
                 ipy.set_next_input(py_code, replace=False)
-                print("Inserted Python code into next cell.")
+                logger.info("Inserted Python code into next cell.")
             else:
-                print("No IPython session found.")
+                logger.warning("No IPython session found.")
             return True
         elif target_platform == "native":
             if self.build_native(extracted, package_name):
-                self.install_and_configure(extracted, package_name, install_env)
+                rows.append(self.install_and_configure(
+                    extracted, package_name, install_env, record=False
+                ))
                 return True
             return False
         elif target_platform == "ios":
             if self.build_ios_app(extracted, package_name):
-                print(f"iOS app '{package_name}' built successfully.")
+                logger.info("iOS app '%s' built successfully.", package_name)
                 return True
             return False
         elif target_platform in ["javascript", "swift"]:
             if self.translate_to_language(extracted, package_name, target_platform):
-                self.install_and_configure(extracted, package_name, install_env)
+                rows.append(self.install_and_configure(
+                    extracted, package_name, install_env, record=False
+                ))
                 return True
             return False
         else:
-            print(f"Unknown target '{target_platform}'. Attempting native build.")
+            logger.warning("Unknown target '%s'. Attempting native build.", target_platform)
             if self.build_native(extracted, package_name):
-                self.install_and_configure(extracted, package_name, install_env)
+                rows.append(self.install_and_configure(
+                    extracted, package_name, install_env, record=False
+                ))
                 return True
             return False
 
@@ -482,9 +1200,9 @@ if ipywidgets_available:
     class AptAnMagics(Magics):
         def __init__(self, shell):
             super().__init__(shell)
-            self.platform_config = PlatformConfig()
+            self.platform_config = get_platform_config()
             self.platform_config.print_platform_info()
-            self.gemini_api_key = os.environ.get("GEMINI_API_KEY")
+            self.gemini_api_key = _GEMINI_API_KEY
             self.aptan_manager = AptAn(self.platform_config, self.gemini_api_key)
 
         @magic_arguments()
@@ -516,43 +1234,69 @@ if ipywidgets_available:
             """
             Forward to `apt ...`
             """
+            import subprocess
             cmd = f"apt {line}"
             print(f"Executing: {cmd}")
             try:
-                subprocess.run(
+                _run_command(
                     cmd,
-                    shell=True,
-                    check=True,
-                    executable=self.platform_config.get_config("shell")
+                    shell_executable=self.platform_config.get_config("shell"),
+                    check=True
                 )
-            except subprocess.CalledProcessError as e:
+            except (subprocess.CalledProcessError, OSError) as e:
                 print(f"Error: {e}")
 
 
 # -----------------------------------------------------------------------------
 # 5) Jedimt Core
 # -----------------------------------------------------------------------------
+class _Script:
+    """A compiled snippet; shared by every script id with the same source."""
+    __slots__ = ("source", "executable")
+
+    def __init__(self, source, executable):
+        self.source = source
+        self.executable = executable
+
+
 class Jedimt:
+    # Distinct sources remembered for sharing; older ones are simply
+    # recompiled if they come back.
+    _SHARED_SCRIPTS_MAX = 32
+
     def __init__(self, mode="compile", gemini_api_key=None):
         self.mode = mode
-        self.platform_config = PlatformConfig()
+        self.platform_config = get_platform_config()
         console.log(f"[blue]Detected platform: {self.platform_config.system}[/blue]")
         self.gemini_api_key = gemini_api_key
         self.aptan_manager = AptAn(self.platform_config, gemini_api_key)
-        self.scripts = {}
+        # Identical code under several ids shares one compiled artifact,
+        # found through a small LRU keyed by content hash.
+        self._by_id = {}
+        self._by_hash = collections.OrderedDict()
 
     def compile_code(self, code_snippet, script_id):
-        exe = f"compiled_code_for_{script_id}"
-        self.scripts[script_id] = {"source": code_snippet, "executable": exe}
+        import hashlib
+        h = hashlib.blake2b(code_snippet.encode(), digest_size=16).hexdigest()
+        compiled = self._by_hash.get(h)
+        if compiled is None:
+            compiled = _Script(code_snippet, f"compiled_code_{h}")
+            self._by_hash[h] = compiled
+            if len(self._by_hash) > self._SHARED_SCRIPTS_MAX:
+                self._by_hash.popitem(last=False)
+        else:
+            self._by_hash.move_to_end(h)
+        self._by_id[script_id] = compiled
         console.log(f"[green]Script '{script_id}' compiled successfully.[/green]")
-        return {"script_id": script_id, "executable": exe}
+        return {"script_id": script_id, "executable": compiled.executable}
 
     def run_script(self, script_id):
-        if script_id not in self.scripts:
+        from rich.panel import Panel
+        if script_id not in self._by_id:
             console.log(f"[red]No such script '{script_id}'[/red]")
             return
         console.log(f"[blue]Running script '{script_id}'...[/blue]")
-        src = self.scripts[script_id]["source"]
+        src = self._by_id[script_id].source
         console.print(Panel(src, title="Script Output"))
 
     def apt_install(self, package_name, target_platform=None):
@@ -563,6 +1307,7 @@ class Jedimt:
             console.log(f"[red]Failed to install '{package_name}'.[/red]")
 
     def shell_command(self, args):
+        import subprocess
         if not args:
             self.print_usage()
             return
@@ -589,11 +1334,10 @@ class Jedimt:
                     console.log("[red]Usage: apt install <pkg> [--target ...][/red]")
                     return
                 pkg_name = subargs[1]
-                tplat = None
-                if "--target" in subargs:
-                    idx = subargs.index("--target")
-                    if idx+1 < len(subargs):
-                        tplat = subargs[idx+1]
+                try:
+                    tplat = subargs[subargs.index("--target") + 1]
+                except (ValueError, IndexError):
+                    tplat = None
                 self.apt_install(pkg_name, tplat)
             else:
                 console.log(f"[red]Unknown subcmd: apt {subcmd}[/red]")
@@ -618,11 +1362,12 @@ class Jedimt:
             full_cmd = " ".join(args)
             console.log(f"[blue]System command: {full_cmd}[/blue]")
             try:
-                subprocess.run(full_cmd, shell=True, check=True)
-            except subprocess.CalledProcessError as e:
+                _run_command(full_cmd, check=True)
+            except (subprocess.CalledProcessError, OSError) as e:
                 console.log(f"[red]Command error: {e}[/red]")
 
     def print_usage(self):
+        from rich.panel import Panel
         console.print(Panel(
             f"Usage: {sys.argv[0]} <command> [args]\n"
             "Commands:\n"
@@ -635,14 +1380,35 @@ class Jedimt:
         ))
 
 
+def _get_jedimt(mode="compile", gemini_api_key=_GEMINI_API_KEY):
+    """Shared Jedimt per (mode, key), so repeated calls reuse its state."""
+    return _jedimt_for(mode, gemini_api_key)
+
+
+@functools.lru_cache(maxsize=4)
+def _jedimt_for(mode, gemini_api_key):
+    return Jedimt(mode=mode, gemini_api_key=gemini_api_key)
+
+
 # -----------------------------------------------------------------------------
 # 6) Optional Kivy GUI
 # -----------------------------------------------------------------------------
-if kivy_available:
+@functools.lru_cache(maxsize=None)
+def _kivy_classes():
+    """Import kivy and build the mapper widget classes on first use."""
+    from kivy.app import App
+    from kivy.uix.boxlayout import BoxLayout
+    from kivy.uix.textinput import TextInput
+    from kivy.uix.button import Button
+    from kivy.uix.scrollview import ScrollView
+    from kivy.uix.gridlayout import GridLayout
+    from kivy.uix.label import Label
+    from kivy.uix.popup import Popup
+
     class InterfaceMapper(BoxLayout):
         def __init__(self, **kwargs):
             super().__init__(orientation="vertical", **kwargs)
-            self.platform_config = PlatformConfig()
+            self.platform_config = get_platform_config()
             self.gemini = Gemini("dummy_api_key", self.platform_config)
             self.code_input = TextInput(
                 text="Enter interface specification here...",
@@ -683,45 +1449,153 @@ if kivy_available:
         def build(self):
             return InterfaceMapper()
 
+    return InterfaceMapper, InterfaceMapperApp
+
+
+def __getattr__(name):
+    # Keep InterfaceMapper/InterfaceMapperApp importable from this module
+    # without paying for kivy at import time.
+    if kivy_available and name in ("InterfaceMapper", "InterfaceMapperApp"):
+        mapper, app = _kivy_classes()
+        return mapper if name == "InterfaceMapper" else app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # -----------------------------------------------------------------------------
 # 7) Enhanced ipywidgets-based Interface (JedimtYescoInterface)
 # -----------------------------------------------------------------------------
 if ipywidgets_available:
+    _LOG_LEVEL_IDS = {'INFO': 1, 'WARNING': 2, 'ERROR': 3}
+
+    class _LogEntry:
+        """One log line, with the fields filters need computed up front."""
+        __slots__ = ("ts", "level_id", "message", "message_lower", "text")
+
+        def __init__(self, ts, level, message):
+            self.ts = ts
+            self.level_id = _LOG_LEVEL_IDS.get(level, 0)
+            self.message = message
+            self.message_lower = message.lower()
+            self.text = f"[{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))}] {level}: {message}"
+
+    class _OutputLogHandler(logging.Handler):
+        """
+        Mirror log records into an Output widget; safe off the kernel thread.
+        Only records logged on the thread that created the handler are shown,
+        so concurrent jobs don't echo into each other's panes.
+        """
+        def __init__(self, output):
+            super().__init__()
+            self.output = output
+            self.thread = threading.get_ident()
+            self.setFormatter(logging.Formatter("%(message)s"))
+
+        def filter(self, record):
+            return record.thread == self.thread and super().filter(record)
+
+        def emit(self, record):
+            self.output.append_stdout(self.format(record) + "\n")
+
+    # Clicks landing this soon after the same button's last run finished were
+    # queued while it was busy; they are dropped rather than replayed.
+    _CLICK_DEBOUNCE = 0.3
+
+    def _one_at_a_time(handler):
+        """
+        Disable the clicked button while `handler` runs. A handler that hands
+        its work to a thread returns True, and the button stays disabled until
+        that work finishes.
+        """
+        @functools.wraps(handler)
+        def wrapper(self, btn):
+            if not isinstance(btn, widgets.Button):
+                # Called directly (handle_install(None) and the like):
+                # there is no button to guard.
+                return handler(self, btn)
+            if btn.disabled:
+                return
+            if time.monotonic() - self._click_done.get(id(btn), 0.0) < _CLICK_DEBOUNCE:
+                return
+            btn.disabled = True
+            deferred = False
+            try:
+                deferred = handler(self, btn) is True
+            finally:
+                if not deferred:
+                    self._release(btn)
+        return wrapper
+
     class JedimtYescoInterface:
         """
         Enhanced ipywidgets interface with improved output handling, logging,
         state management, and UX improvements.
         """
         def __init__(self, jedimt_instance=None, gemini_api_key=None):
-            self.jedimt = jedimt_instance or Jedimt(mode="compile", gemini_api_key=gemini_api_key)
+            self.jedimt = jedimt_instance or _get_jedimt("compile", gemini_api_key)
             self.state = {
                 'current_project': None,
                 'last_compile_result': None,
-                'compile_history': [],
-                'package_history': [],
-                'logs': []
+                # Bounded so a long-lived notebook session cannot grow them forever.
+                'compile_history': collections.deque(maxlen=500),
+                'package_history': collections.deque(maxlen=200),
+                'logs': collections.deque(maxlen=self._LOG_LEVEL_MAX),
+                # Per-level views of 'logs' so filtering never rescans it.
+                'logs_by_level': {
+                    level: collections.deque(maxlen=self._LOG_LEVEL_MAX)
+                    for level in ('INFO', 'WARNING', 'ERROR')
+                }
             }
+            self._batch_local = threading.local()
+            self._open_questions = []
+            self._click_done = {}
+            self._executor = None
+            self._progress_lock = threading.Lock()
+            self._last_progress_push = 0.0
+            self._pending_progress = None
+            self._progress_timer = None
             self.setup_logging()
             self.setup_widgets()
 
         # --------------------------
         # Logging + Output
         # --------------------------
+        _LOG_FLUSH_INTERVAL = 0.033
+        _LOG_LEVEL_MAX = 10000
+        _PROGRESS_MIN_INTERVAL = 0.05
+
         def setup_logging(self):
             self.log_output = widgets.Output()
+            # Lines are queued and pushed to the frontend at most ~30 times a
+            # second, one comm message per batch instead of one per line.
+            self._log_queue = collections.deque(maxlen=10000)
+            self._log_lock = threading.Lock()
+            self._log_timer = None
 
         def log(self, message, level="INFO"):
-            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-            entry = f"[{timestamp}] {level}: {message}"
-            self.state['logs'].append(entry)
-            with self.log_output:
-                if level == "ERROR":
-                    print(f"\033[91m{entry}\033[0m")
-                elif level == "WARNING":
-                    print(f"\033[93m{entry}\033[0m")
-                else:
-                    print(entry)
+            record = _LogEntry(time.time(), level, message)
+            self.state['logs'].append(record)
+            self.state['logs_by_level'].setdefault(
+                level, collections.deque(maxlen=self._LOG_LEVEL_MAX)
+            ).append(record)
+            entry = record.text
+            if level == "ERROR":
+                entry = f"\033[91m{entry}\033[0m"
+            elif level == "WARNING":
+                entry = f"\033[93m{entry}\033[0m"
+            with self._log_lock:
+                self._log_queue.append(entry)
+                if self._log_timer is None:
+                    self._log_timer = threading.Timer(self._LOG_FLUSH_INTERVAL, self._flush_logs)
+                    self._log_timer.daemon = True
+                    self._log_timer.start()
+
+        def _flush_logs(self):
+            with self._log_lock:
+                batch = list(self._log_queue)
+                self._log_queue.clear()
+                self._log_timer = None
+            if batch:
+                self.log_output.append_stdout("\n".join(batch) + "\n")
 
         # --------------------------
         # Main Widgets + Layout
@@ -745,14 +1619,14 @@ if ipywidgets_available:
             self.simulator_tab = self.create_simulator_tab()
             self.logs_tab = self.create_logs_tab()
 
-            self.tab.children = [
+            self.tab.children = (
                 self.package_tab,
                 self.compiler_tab,
                 self.project_tab,
                 self.simulator_tab,
                 self.logs_tab
-            ]
-            titles = ["Package Manager", "Compiler", "Project Tools", "iOS Simulator", "Logs"]
+            )
+            titles = ("Package Manager", "Compiler", "Project Tools", "iOS Simulator", "Logs")
             for i, t in enumerate(titles):
                 self.tab.set_title(i, t)
 
@@ -765,15 +1639,15 @@ if ipywidgets_available:
             )
             clear_btn.on_click(self.clear_output)
 
-            self.main_layout = widgets.VBox([
+            self.main_layout = widgets.VBox((
                 self.status_bar,
                 self.tab,
-                widgets.HBox([self.progress, clear_btn]),
+                widgets.HBox((self.progress, clear_btn)),
                 widgets.HTML("<h3>Output:</h3>"),
                 self.output,
                 widgets.HTML("<h3>Logs:</h3>"),
                 self.log_output
-            ], layout=widgets.Layout(padding='10px'))
+            ), layout=widgets.Layout(padding='10px'))
 
         # --------------------------
         # Tabs
@@ -923,221 +1797,414 @@ if ipywidgets_available:
         # --------------------------
         # Helper Methods
         # --------------------------
+        @contextlib.contextmanager
+        def _batch_updates(self):
+            """
+            Defer status/progress assignments made inside the block and apply
+            only the last value per trait on exit, in one sync per widget.
+            """
+            if getattr(self._batch_local, "pending", None) is not None:
+                yield
+                return
+            self._batch_local.pending = {}
+            try:
+                yield
+            finally:
+                pending = self._batch_local.pending
+                self._batch_local.pending = None
+                by_widget = {}
+                for (widget, attr), value in pending.items():
+                    by_widget.setdefault(widget, []).append((attr, value))
+                for widget, updates in by_widget.items():
+                    with widget.hold_sync():
+                        for attr, value in updates:
+                            setattr(widget, attr, value)
+
+        def _set_widget(self, widget, attr, value):
+            pending = getattr(self._batch_local, "pending", None)
+            if pending is None:
+                setattr(widget, attr, value)
+            else:
+                pending[(widget, attr)] = value
+
+        # Status bar markup is fixed per color; only the message varies.
+        _status_prefix = {
+            c: f'<div style="padding: 5px; background-color: #f0f0f0; color: {c};">'
+            for c in ('black', 'blue', 'green', 'red', 'yellow')
+        }
+
         def update_status(self, msg, color='black'):
-            self.status_bar.value = f'<div style="padding: 5px; background-color: #f0f0f0; color: {color};">{msg}</div>'
+            prefix = self._status_prefix.get(color)
+            if prefix is None:
+                prefix = f'<div style="padding: 5px; background-color: #f0f0f0; color: {color};">'
+                self._status_prefix[color] = prefix
+            # No comparison with the live value here: inside a batch it may
+            # already be stale. Batches keep the last write, and traitlets
+            # does not sync an assignment that changes nothing.
+            self._set_widget(self.status_bar, 'value', prefix + msg + '</div>')
 
         def update_progress(self, value):
-            self.progress.value = value
+            if getattr(self._batch_local, "pending", None) is not None:
+                self._set_widget(self.progress, 'value', value)
+                return
+            # Intermediate values arriving faster than the interval are
+            # dropped; the latest one is always flushed, and 0/100 go at once.
+            with self._progress_lock:
+                wait = self._last_progress_push + self._PROGRESS_MIN_INTERVAL - time.monotonic()
+                if value in (0, 100) or wait <= 0:
+                    if self._progress_timer is not None:
+                        self._progress_timer.cancel()
+                        self._progress_timer = None
+                    self._pending_progress = None
+                    self._last_progress_push = time.monotonic()
+                    self.progress.value = value
+                    return
+                self._pending_progress = value
+                if self._progress_timer is None:
+                    self._progress_timer = threading.Timer(wait, self._flush_progress)
+                    self._progress_timer.daemon = True
+                    self._progress_timer.start()
+
+        def _flush_progress(self):
+            with self._progress_lock:
+                value = self._pending_progress
+                self._pending_progress = None
+                self._progress_timer = None
+                if value is not None:
+                    self._last_progress_push = time.monotonic()
+                    self.progress.value = value
 
         def clear_output(self, _btn=None):
             with self.output:
                 clear_output()
 
         def clear_logs(self, _btn=None):
-            self.state['logs'] = []
-            with self.log_output:
-                clear_output()
+            self.state['logs'].clear()
+            for bucket in self.state['logs_by_level'].values():
+                bucket.clear()
+            with self._log_lock:
+                self._log_queue.clear()
+            self.log_output.outputs = ()
 
         def export_logs(self, _btn=None):
             stamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"jedimt_logs_{stamp}.txt"
             with open(filename, 'w') as f:
-                f.write('\n'.join(self.state['logs']))
+                f.write('\n'.join(e.text for e in self.state['logs']))
             self.log(f"Logs exported to {filename}", "INFO")
 
         def filter_logs(self, change):
             level = change['new']
-            with self.log_output:
-                clear_output()
-                for log_line in self.state['logs']:
-                    if level == 'ALL' or f"{level}:" in log_line:
-                        print(log_line)
+            if level == 'ALL':
+                lines = self.state['logs']
+            else:
+                lines = self.state['logs_by_level'].get(level, ())
+            # One trait write swaps the whole pane; clear_output(wait=True)
+            # only clears in the front-end, leaving the old lines in `outputs`.
+            self.log_output.outputs = (
+                {"output_type": "stream", "name": "stdout",
+                 "text": "\n".join(e.text for e in lines) + "\n"},
+            ) if lines else ()
+
+        def search_logs(self, query, min_level='INFO'):
+            """Entries at or above `min_level` whose message contains `query`."""
+            min_id = _LOG_LEVEL_IDS.get(min_level, 0)
+            query = query.lower()
+            return [
+                e for e in self.state['logs']
+                if e.level_id >= min_id and query in e.message_lower
+            ]
 
         # --------------------------
         # Event Handlers
         # --------------------------
+        @_one_at_a_time
         def handle_install(self, _btn):
             self.update_status("Installing package...", "blue")
-            self.update_progress(0)
-            with self.output:
-                clear_output()
-                try:
-                    pkg = self.package_name.value
-                    tgt = self.target_platform.value
-                    if not pkg:
-                        raise ValueError("Package name is required")
-                    self.log(f"Starting installation of '{pkg}' for '{tgt}'")
-                    self.update_progress(30)
-
-                    if pkg not in self.state['package_history']:
-                        self.state['package_history'].append(pkg)
-                        self.package_history_dropdown.options = self.state['package_history']
-
-                    self.update_progress(60)
-                    self.jedimt.apt_install(pkg, tgt)
-                    self.update_progress(100)
-
-                    self.log(f"Installed '{pkg}' successfully")
-                    self.update_status("Installation complete", "green")
-                except Exception as e:
-                    self.log(f"Installation failed: {e}", "ERROR")
-                    self.update_status("Installation failed", "red")
-                finally:
-                    self.update_progress(0)
-
+            with self._batch_updates():
+                self.update_progress(0)
+                with self.output:
+                    clear_output(wait=True)
+                    try:
+                        pkg = self.package_name.value
+                        tgt = self.target_platform.value
+                        if not pkg:
+                            raise ValueError("Package name is required")
+                        self.log(f"Starting installation of '{pkg}' for '{tgt}'")
+                        self.update_progress(30)
+
+                        if pkg not in self.state['package_history']:
+                            self.state['package_history'].append(pkg)
+                            self.package_history_dropdown.options = tuple(self.state['package_history'])
+                    except Exception as e:
+                        self.log(f"Installation failed: {e}", "ERROR")
+                        self.update_status("Installation failed", "red")
+                        self.update_progress(0)
+                        return
+
+            def work():
+                self.update_progress(60)
+                self.jedimt.apt_install(pkg, tgt)
+                self.update_progress(100)
+                self.log(f"Installed '{pkg}' successfully")
+                self.update_status("Installation complete", "green")
+            return self._in_background(work, "Installation", _btn, "Installation failed")
+
+        @_one_at_a_time
         def handle_compile(self, _btn):
             self.update_status("Compiling script...", "blue")
-            self.update_progress(0)
-            with self.output:
-                clear_output()
-                try:
-                    sid = self.script_id.value
-                    code = self.code_area.value
-                    if not sid or not code.strip():
-                        raise ValueError("Script ID and code required.")
-                    self.log(f"Compiling '{sid}' with optimization {self.optimization_level.value}")
-                    self.update_progress(50)
-                    result = self.jedimt.compile_code(code, sid)
-                    self.state['last_compile_result'] = result
-                    self.state['compile_history'].append(result)
-                    print(f"Script '{sid}' compiled.")
-                    self.log(f"Compile success: {result}")
-                    self.update_status("Compilation complete", "green")
-                except Exception as e:
-                    self.log(f"Compile error: {e}", "ERROR")
-                    self.update_status("Compile failed", "red")
-                finally:
-                    self.update_progress(0)
-
+            with self._batch_updates():
+                self.update_progress(0)
+                with self.output:
+                    clear_output(wait=True)
+                    try:
+                        sid = self.script_id.value
+                        code = self.code_area.value
+                        if not sid or not code.strip():
+                            raise ValueError("Script ID and code required.")
+                        self.log(f"Compiling '{sid}' with optimization {self.optimization_level.value}")
+                        self.update_progress(50)
+                        result = self.jedimt.compile_code(code, sid)
+                        self.state['last_compile_result'] = result
+                        self.state['compile_history'].append(result)
+                        print(f"Script '{sid}' compiled.")
+                        self.log(f"Compile success: {result}")
+                        self.update_status("Compilation complete", "green")
+                    except Exception as e:
+                        self.log(f"Compile error: {e}", "ERROR")
+                        self.update_status("Compile failed", "red")
+                    finally:
+                        self.update_progress(0)
+
+        @_one_at_a_time
         def handle_run(self, _btn):
             self.update_status("Running script...", "blue")
-            self.update_progress(0)
-            with self.output:
-                clear_output()
-                try:
-                    sid = self.script_id.value
-                    if not sid:
-                        raise ValueError("Script ID required to run.")
-                    self.update_progress(50)
-                    self.jedimt.run_script(sid)
-                    self.update_progress(100)
-                    self.update_status("Script run complete", "green")
-                except Exception as e:
-                    self.log(f"Run error: {e}", "ERROR")
-                    self.update_status("Run failed", "red")
-                finally:
-                    self.update_progress(0)
-
+            with self._batch_updates():
+                self.update_progress(0)
+                with self.output:
+                    clear_output(wait=True)
+                    try:
+                        sid = self.script_id.value
+                        if not sid:
+                            raise ValueError("Script ID required to run.")
+                        self.update_progress(50)
+                        self.jedimt.run_script(sid)
+                        self.update_progress(100)
+                        self.update_status("Script run complete", "green")
+                    except Exception as e:
+                        self.log(f"Run error: {e}", "ERROR")
+                        self.update_status("Run failed", "red")
+                    finally:
+                        self.update_progress(0)
+
+        @_one_at_a_time
         def handle_create_project(self, _btn):
             self.update_status("Creating project...", "blue")
-            self.update_progress(0)
-            with self.output:
-                clear_output()
-                try:
-                    proj = self.project_name.value
-                    if not proj:
-                        raise ValueError("Project name is required.")
-                    self.log(f"Creating project '{proj}'")
-                    self.update_progress(40)
-                    if not os.path.exists(proj):
-                        os.makedirs(proj)
-                        print(f"Project '{proj}' created.")
-                    else:
-                        print(f"Project '{proj}' already exists.")
-                    self.update_progress(100)
-                    self.update_status("Project creation complete", "green")
-                except Exception as e:
-                    self.log(f"Create project error: {e}", "ERROR")
-                    self.update_status("Project creation failed", "red")
-                finally:
-                    self.update_progress(0)
-
+            with self._batch_updates():
+                self.update_progress(0)
+                with self.output:
+                    clear_output(wait=True)
+                    try:
+                        proj = self.project_name.value
+                        if not proj:
+                            raise ValueError("Project name is required.")
+                        self.log(f"Creating project '{proj}'")
+                        self.update_progress(40)
+                        try:
+                            os.makedirs(proj)
+                            print(f"Project '{proj}' created.")
+                        except FileExistsError:
+                            print(f"Project '{proj}' already exists.")
+                        self.update_progress(100)
+                        self.update_status("Project creation complete", "green")
+                    except Exception as e:
+                        self.log(f"Create project error: {e}", "ERROR")
+                        self.update_status("Project creation failed", "red")
+                    finally:
+                        self.update_progress(0)
+
+        @_one_at_a_time
         def handle_sign_project(self, _btn):
             self.update_status("Signing project...", "blue")
-            self.update_progress(0)
-            with self.output:
-                clear_output()
+            with self._batch_updates():
+                self.update_progress(0)
+                with self.output:
+                    clear_output(wait=True)
+                    try:
+                        proj = self.project_name.value
+                        ident = self.identity.value
+                        if not proj or not ident:
+                            raise ValueError("Project name and identity required.")
+                        app_path = os.path.join(proj, "build")
+                        self.update_progress(40)
+                        if not os.path.exists(app_path):
+                            raise FileNotFoundError(f"Path '{app_path}' doesn't exist.")
+                    except Exception as e:
+                        self.log(f"Sign error: {e}", "ERROR")
+                        self.update_status("Signing failed", "red")
+                        self.update_progress(0)
+                        return
+
+            def work():
+                rc, err = _codesign(app_path, ident)
+                if rc:
+                    raise RuntimeError(err or f"codesign exited with status {rc}")
+                self.output.append_stdout("App signed successfully.\n")
+                self.log(f"Signed '{proj}' with identity '{ident}'")
+                self.update_progress(100)
+                self.update_status("Signing complete", "green")
+            return self._in_background(work, "Sign", _btn, "Signing failed")
+
+        def _release(self, btn):
+            if isinstance(btn, widgets.Button):
+                self._click_done[id(btn)] = time.monotonic()
+                btn.disabled = False
+
+        def _in_background(self, work, label, btn, failed=None):
+            """
+            Run `work` on the interface's worker pool so the kernel keeps
+            serving other widget callbacks meanwhile; failures are reported
+            like handlers do. AptAn's log lines, prints and console output
+            are streamed into the output pane while it runs, y/n questions
+            are asked there, and `btn` is re-enabled once it is done.
+            """
+            for name in ("stdout", "stderr"):
+                stream = getattr(sys, name)
+                if not isinstance(stream, _JobStream):
+                    setattr(sys, name, _JobStream(stream))
+
+            def runner():
+                handler = _OutputLogHandler(self.output)
+                logger.addHandler(handler)
+                _job_context.output = self.output
+                _job_context.confirm = self._ask_in_pane
                 try:
-                    proj = self.project_name.value
-                    ident = self.identity.value
-                    if not proj or not ident:
-                        raise ValueError("Project name and identity required.")
-                    app_path = os.path.join(proj, "build")
-                    self.update_progress(40)
-                    if os.path.exists(app_path):
-                        cmd = f"codesign -s {ident} {app_path}"
-                        subprocess.run(cmd, shell=True, check=True)
-                        print("App signed successfully.")
-                        self.log(f"Signed '{proj}' with identity '{ident}'")
-                        self.update_progress(100)
-                        self.update_status("Signing complete", "green")
-                    else:
-                        raise FileNotFoundError(f"Path '{app_path}' doesn't exist.")
+                    # Not batched: progress from `work` has to reach the bar
+                    # while it runs (throttled by update_progress).
+                    work()
                 except Exception as e:
-                    self.log(f"Sign error: {e}", "ERROR")
-                    self.update_status("Signing failed", "red")
-                finally:
+                    self.log(f"{label} error: {e}", "ERROR")
+                    with self._batch_updates():
+                        self.update_status(failed or f"{label} failed", "red")
+                        self.update_progress(0)
+                else:
                     self.update_progress(0)
+                finally:
+                    _job_context.output = _job_context.confirm = None
+                    logger.removeHandler(handler)
+                    self._release(btn)
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                self._executor = ThreadPoolExecutor(max_workers=2)
+            self._executor.submit(runner)
+            return True
 
+        def _ask_in_pane(self, question):
+            """
+            Ask a y/n question from a worker thread: Yes/No buttons go into
+            the output pane and the job waits for a click, which the kernel
+            thread delivers. Closing the interface answers No.
+            """
+            answered = threading.Event()
+            answer = []
+
+            def choose(value):
+                if not answered.is_set():
+                    answer.append(value)
+                    answered.set()
+
+            yes = widgets.Button(description="Yes", button_style="success")
+            no = widgets.Button(description="No", button_style="danger")
+            yes.on_click(lambda _btn: choose(True))
+            no.on_click(lambda _btn: choose(False))
+            self._open_questions.append(choose)
+            box = widgets.HBox((widgets.Label(question), yes, no))
+            # The view bundle by hand: append_display_data would go through
+            # IPython's formatter, which is not safe off the kernel thread.
+            self.output.outputs += ({
+                "output_type": "display_data", "metadata": {},
+                "data": {
+                    "text/plain": question,
+                    "application/vnd.jupyter.widget-view+json": {
+                        "version_major": 2, "version_minor": 0, "model_id": box.model_id,
+                    },
+                },
+            },)
+            answered.wait()
+            self._open_questions.remove(choose)
+            yes.disabled = no.disabled = True
+            return answer[0]
+
+        @_one_at_a_time
         def handle_setup(self, _btn):
             self.update_status("Setting up project...", "blue")
-            self.update_progress(0)
-            with self.output:
-                clear_output()
-                try:
-                    self.log("Performing project setup tasks.")
-                    time.sleep(1)  # simulate
-                    print("Setup complete.")
-                    self.update_progress(100)
-                    self.update_status("Setup complete", "green")
-                except Exception as e:
-                    self.log(f"Setup error: {e}", "ERROR")
-                    self.update_status("Setup failed", "red")
-                finally:
-                    self.update_progress(0)
-
+            with self._batch_updates():
+                self.update_progress(0)
+                with self.output:
+                    clear_output(wait=True)
+                self.log("Performing project setup tasks.")
+
+            def work():
+                time.sleep(1)  # simulate
+                self.output.append_stdout("Setup complete.\n")
+                self.update_progress(100)
+                self.update_status("Setup complete", "green")
+            return self._in_background(work, "Setup", _btn)
+
+        @_one_at_a_time
         def handle_simulator(self, _btn):
             self.update_status("Launching simulator...", "blue")
-            self.update_progress(0)
-            with self.output:
-                clear_output()
-                try:
-                    proj = self.sim_project.value
-                    dev = self.device_selector.value
-                    orient = self.orientation.value
-                    if not proj:
-                        raise ValueError("Project name required.")
-                    self.log(f"Launch simulator for '{proj}' on device '{dev}' ({orient})")
-                    time.sleep(1)  # simulate
-                    print(f"Simulator launched for '{proj}' with device '{dev}'. Orientation: {orient}")
-                    self.update_progress(100)
-                    self.update_status("Simulator running", "green")
-                except Exception as e:
-                    self.log(f"Simulator error: {e}", "ERROR")
-                    self.update_status("Simulator failed", "red")
-                finally:
-                    self.update_progress(0)
+            with self._batch_updates():
+                self.update_progress(0)
+                with self.output:
+                    clear_output(wait=True)
+                    try:
+                        proj = self.sim_project.value
+                        dev = self.device_selector.value
+                        orient = self.orientation.value
+                        if not proj:
+                            raise ValueError("Project name required.")
+                        self.log(f"Launch simulator for '{proj}' on device '{dev}' ({orient})")
+                    except Exception as e:
+                        self.log(f"Simulator error: {e}", "ERROR")
+                        self.update_status("Simulator failed", "red")
+                        self.update_progress(0)
+                        return
+
+            def work():
+                time.sleep(1)  # simulate
+                self.output.append_stdout(
+                    f"Simulator launched for '{proj}' with device '{dev}'. Orientation: {orient}\n"
+                )
+                self.update_progress(100)
+                self.update_status("Simulator running", "green")
+            return self._in_background(work, "Simulator", _btn)
 
+        @_one_at_a_time
         def handle_debug(self, _btn):
             self.update_status("Debugging...", "blue")
-            self.update_progress(0)
-            with self.output:
-                clear_output()
-                try:
-                    proj = self.sim_project.value
-                    lang = self.language.value
-                    if not proj:
-                        raise ValueError("Project name required.")
-                    self.log(f"Debugging '{proj}' in {lang}")
-                    time.sleep(1)  # simulate
-                    print(f"Debug session started for '{proj}' ({lang}).")
-                    self.update_progress(100)
-                    self.update_status("Debug session active", "green")
-                except Exception as e:
-                    self.log(f"Debug error: {e}", "ERROR")
-                    self.update_status("Debug failed", "red")
-                finally:
-                    self.update_progress(0)
+            with self._batch_updates():
+                self.update_progress(0)
+                with self.output:
+                    clear_output(wait=True)
+                    try:
+                        proj = self.sim_project.value
+                        lang = self.language.value
+                        if not proj:
+                            raise ValueError("Project name required.")
+                        self.log(f"Debugging '{proj}' in {lang}")
+                    except Exception as e:
+                        self.log(f"Debug error: {e}", "ERROR")
+                        self.update_status("Debug failed", "red")
+                        self.update_progress(0)
+                        return
+
+            def work():
+                time.sleep(1)  # simulate
+                self.output.append_stdout(f"Debug session started for '{proj}' ({lang}).\n")
+                self.update_progress(100)
+                self.update_status("Debug session active", "green")
+            return self._in_background(work, "Debug", _btn)
 
         # --------------------------
         # Display
@@ -1145,10 +2212,253 @@ if ipywidgets_available:
         def display(self):
             display(self.main_layout)
 
+        def close(self):
+            """
+            Detach observers and close every widget of this interface. The
+            widget registry holds the handlers strongly, so this is what lets
+            the interface be collected.
+            """
+            for key, live in list(_interfaces.items()):
+                if live is self:
+                    del _interfaces[key]
+            for timer in (self._log_timer, self._progress_timer):
+                if timer is not None:
+                    timer.cancel()
+            for choose in list(self._open_questions):
+                choose(False)
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            self.log_filter.unobserve_all()
+            stack = [self.main_layout]
+            while stack:
+                widget = stack.pop()
+                stack.extend(getattr(widget, "children", ()))
+                widget.close()
+
 
 # -----------------------------------------------------------------------------
 # 8) Yesco CLI
 # -----------------------------------------------------------------------------
+_SIM_HTML = b"""<!DOCTYPE html>
+<html>
+<head>
+    <title>iOS Simulator</title>
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/jquery/3.6.0/jquery.min.js"></script>
+    <script src="https://cdn.jsdelivr.net/npm/vue/dist/vue.js"></script>
+</head>
+<body>
+  <div id="app"></div>
+  <script> new Vue({ el: '#app' }); </script>
+  <script type="module" src="src/main.js"></script>
+</body>
+</html>"""
+
+_SIM_INDEX_JS = b"""const express = require('express');
+const app = express();
+const port = 3000;
+app.use(express.static(__dirname));
+app.listen(port, () => {
+  console.log(`Server listening on port ${port}`);
+});
+"""
+
+_SIM_PACKAGE_JSON = _json_dumps({
+    "name": "__PROJECT__-simulator",
+    "version": "1.0.0",
+    "description": "Node-based iOS simulator for testing",
+    "main": "index.js",
+    "scripts": {"start": "node index.js"},
+    "author": "Your Name",
+    "license": "ISC"
+}, indent=True)
+
+# Fixed scaffold files, relative to the simulator dir.
+_SIM_TEMPLATES = {
+    "simulator.html": _SIM_HTML,
+    "index.js": _SIM_INDEX_JS,
+}
+# Written by run-simulator next to the scaffold; read by stop-simulator.
+# Holds "<pid> <start time>", or just the pid where /proc is unavailable.
+_SIM_PID_FILE = ".pid"
+
+
+def _proc_start_time(pid):
+    """The process's start time in clock ticks from /proc, or None."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            stat_line = f.read()
+    except OSError:
+        return None
+    # Field 22; the command name (field 2) may itself contain spaces.
+    return stat_line.rsplit(")", 1)[1].split()[19]
+
+
+def _is_simulator_process(pid, started):
+    """Whether `pid` is still the session leader run-simulator recorded."""
+    if started is not None and _proc_start_time(pid) != started:
+        return False
+    if hasattr(os, "getpgid"):
+        # Started with start_new_session, so it leads its own group.
+        return os.getpgid(pid) == pid
+    return True
+
+_GENERATED_PANEL = "Generated Code"
+_COMPILED_PANEL = "Compiled Code"
+_CHANGES_PANEL = "Changes"
+
+
+def _side_by_side(title, left_title, left_code, right_title, right_code, lexer="javascript"):
+    """
+    Two highlighted code panes in one Panel. Syntax renders line by line, so
+    the sources are never spliced into one big markup string.
+    """
+    from rich.columns import Columns
+    from rich.panel import Panel
+    from rich.syntax import Syntax
+    return Panel(
+        Columns([
+            Panel(Syntax(left_code, lexer), title=left_title),
+            Panel(Syntax(right_code, lexer), title=right_title),
+        ], equal=True, expand=True),
+        title=title
+    )
+
+
+# writev() rejects more iovecs than this (POSIX minimum for IOV_MAX).
+_IOV_MAX = 1024
+
+
+# One ring per thread, set up on first use and kept for the life of the
+# process, so repeated installs don't pay io_uring_queue_init every batch.
+_URING_ENTRIES = 256
+_uring_local = threading.local()
+
+
+def _get_ring():
+    ring = getattr(_uring_local, "ring", None)
+    if ring is None:
+        import liburing
+        ring = liburing.Ring()
+        liburing.io_uring_queue_init(_URING_ENTRIES, ring)
+        _uring_local.ring = ring
+    return ring
+
+
+def _read_files_uring(paths):
+    """
+    Read every file in `paths` through this thread's io_uring, one submission
+    per ring-sized batch, and return their contents in order.
+    """
+    ring = _get_ring()
+    chunks = []
+    for start in range(0, len(paths), _URING_ENTRIES):
+        chunks.extend(_read_batch_uring(ring, paths[start:start + _URING_ENTRIES]))
+    return chunks
+
+
+def _read_batch_uring(ring, paths):
+    # Opens stay synchronous and happen before any SQE is queued, so a missing
+    # file can't leave half a batch sitting in the shared ring.
+    import liburing
+    cqe = liburing.Cqe()
+    fds = []
+    try:
+        for path in paths:
+            fds.append(os.open(path, os.O_RDONLY))
+        bufs = [bytearray(os.fstat(fd).st_size) for fd in fds]
+        for i, (fd, buf) in enumerate(zip(fds, bufs)):
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_read(sqe, fd, buf, 0)
+            liburing.io_uring_sqe_set_data64(sqe, i)
+        liburing.io_uring_submit(ring)
+
+        # Reap every completion before raising on any of them.
+        results = [0] * len(fds)
+        for _ in fds:
+            liburing.io_uring_wait_cqe(ring, cqe)
+            entry = cqe[0]
+            results[entry.user_data] = entry.res
+            liburing.io_uring_cqe_seen(ring, entry)
+
+        chunks = []
+        for fd, buf, res in zip(fds, bufs, results):
+            size = liburing.trap_error(res)
+            data = bytes(buf[:size])
+            # Short reads are rare on regular files; finish them synchronously.
+            while size < len(buf):
+                more = os.pread(fd, len(buf) - size, size)
+                if not more:
+                    break
+                data += more
+                size += len(more)
+            chunks.append(data)
+        return chunks
+    finally:
+        for fd in fds:
+            os.close(fd)
+
+
+def _read_files(paths):
+    """Read `paths` as bytes, batching through io_uring when it is usable."""
+    if liburing_available and paths:
+        try:
+            return _read_files_uring(paths)
+        except (ImportError, OSError):
+            # Old kernel or io_uring disabled (e.g. seccomp): use plain reads.
+            pass
+    chunks = []
+    for path in paths:
+        with open(path, "rb") as f:
+            chunks.append(f.read())
+    return chunks
+
+
+def _writev_all(fd, chunks):
+    """Write every byte of `chunks` to `fd`, resuming after short writes."""
+    if not hasattr(os, "writev"):
+        data = memoryview(b"".join(chunks))
+        while data:
+            data = data[os.write(fd, data):]
+        return
+    for i in range(0, len(chunks), _IOV_MAX):
+        batch = list(chunks[i:i + _IOV_MAX])
+        while batch:
+            written = os.writev(fd, batch)
+            done = 0
+            while done < len(batch) and written >= len(batch[done]):
+                written -= len(batch[done])
+                done += 1
+            batch = batch[done:]
+            if written:
+                batch[0] = memoryview(batch[0])[written:]
+
+
+def _write_chunks(path, chunks):
+    """
+    Atomically replace `path` with `chunks`: write a temp file beside it (one
+    scatter-gather call where supported), then rename it over the target, so
+    an interrupted run never leaves a half-written file behind. A symlinked
+    `path` keeps its link (the file it points at is replaced) and an existing
+    file keeps its mode.
+    """
+    path = os.path.realpath(path)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o644
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        try:
+            _writev_all(fd, chunks)
+            os.chmod(tmp, mode)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
 @click.group()
 def yesco():
     """Yesco: Manage projects and build applications."""
@@ -1157,10 +2467,12 @@ def yesco():
 @yesco.command()
 @click.argument("project_name")
 def create_project(project_name):
-    if not os.path.exists(project_name):
+    # mkdir itself reports whether the project was already there: no separate
+    # stat, and no window between the check and the create.
+    try:
         os.makedirs(project_name)
         console.log(f"[green]Project '{project_name}' created.[/green]")
-    else:
+    except FileExistsError:
         console.log(f"[red]Project '{project_name}' already exists.[/red]")
 
 @yesco.command()
@@ -1171,51 +2483,142 @@ def sign_project(project_name, identity):
     if os.path.exists(app_path):
         console.log(f"[blue]Signing '{app_path}' with identity '{identity}'...[/blue]")
         try:
-            subprocess.run(f"codesign -s {identity} {app_path}", shell=True, check=True)
-            console.log("[green]App signed successfully.[/green]")
-        except subprocess.CalledProcessError as e:
+            rc, err = _codesign(app_path, identity)
+        except OSError as e:
             console.log(f"[red]Signing failed: {e}[/red]")
+            return
+        if rc == 0:
+            console.log("[green]App signed successfully.[/green]")
+        else:
+            console.log(f"[red]Signing failed: {err or f'exit status {rc}'}[/red]")
     else:
         console.log(f"[red]Path '{app_path}' does not exist.[/red]")
 
+def _run_streamed(cmd):
+    """
+    Run `cmd`, echoing its stderr line by line as it arrives rather than
+    buffering it all until exit. stdout is discarded. Returns the exit status.
+    """
+    import subprocess
+    with subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        text=True, errors="replace", bufsize=1
+    ) as p:
+        for line in p.stderr:
+            # Compiler output is full of brackets; never read it as markup.
+            console.log(line.rstrip(), style="yellow", markup=False)
+        return p.wait()
+
+
+# argv builders per language: (sources, output_file) -> command.
+_COMPILE_CMDS = {
+    "swift": lambda sources, out: ["swiftc", *sources, "-o", out],
+    "objc": lambda sources, out: ["clang", "-framework", "Foundation", *sources, "-o", out],
+    "rust": lambda sources, out: ["rustc", *sources, "-o", out],
+}
+
+
+def compile_batch(lang, sources, output_file):
+    """
+    Compile all `sources` with one compiler process. swiftc and clang accept
+    several inputs per invocation; rustc builds a single crate root.
+    Diagnostics are streamed as they come; returns the exit status.
+    """
+    builder = _COMPILE_CMDS.get(lang)
+    if builder is None:
+        raise ValueError(f"Unsupported language: {lang}.")
+    if lang == "rust" and len(sources) != 1:
+        raise ValueError("rustc takes a single crate root.")
+    return _run_streamed(builder(sources, output_file))
+
+
+def _compile_crate(source, output_file):
+    """
+    Process-pool worker for one Rust crate. Returns (exit status, error):
+    failures to start rustc come back as a message rather than raising out
+    of executor.map.
+    """
+    import subprocess
+    try:
+        return compile_batch("rust", (source,), output_file), None
+    except (OSError, subprocess.SubprocessError) as e:
+        return None, str(e)
+
+
+def _crate_outputs(sources, output_dir):
+    """
+    One executable per crate, named after its source file. Two sources
+    with the same stem (a/main.rs, b/main.rs) would overwrite each other's
+    output, so they are refused up front.
+    """
+    outputs = [
+        os.path.join(output_dir, os.path.splitext(os.path.basename(src))[0])
+        for src in sources
+    ]
+    seen = {}
+    for src, out in zip(sources, outputs):
+        if out in seen:
+            raise ValueError(
+                f"'{seen[out]}' and '{src}' would both be built as '{out}'."
+            )
+        seen[out] = src
+    return outputs
+
 @yesco.command()
-@click.argument("source_file")
+@click.argument("source_files", nargs=-1, required=True)
 @click.argument("output_file")
-@click.option("--language", prompt="Language (swift/objc/rust)", help="Language of the source file.")
-def compile_source(source_file, output_file, language):
+@click.option("--language", prompt="Language (swift/objc/rust)", help="Language of the source files.")
+def compile_source(source_files, output_file, language):
     lang_lower = language.lower()
-    if lang_lower == "swift":
-        cmd = f"swiftc {source_file} -o {output_file}"
-    elif lang_lower == "objc":
-        cmd = f"clang -framework Foundation {source_file} -o {output_file}"
-    elif lang_lower == "rust":
-        cmd = f"rustc {source_file} -o {output_file}"
-    else:
-        console.log(f"[red]Unsupported language: {language}.[/red]")
+    if lang_lower == "rust" and len(source_files) > 1:
+        # Each file is its own crate: fan them out across cores into output_file/.
+        from concurrent.futures import ProcessPoolExecutor
+        try:
+            outputs = _crate_outputs(source_files, output_file)
+        except ValueError as e:
+            console.log(f"[red]{e}[/red]")
+            return
+        os.makedirs(output_file, exist_ok=True)
+        console.log(f"[blue]Compiling {len(source_files)} Rust crates into '{output_file}'[/blue]")
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = executor.map(_compile_crate, source_files, outputs)
+            for src, out, (rc, err) in zip(source_files, outputs, results):
+                if rc == 0:
+                    console.log(f"[green]Rust compilation successful: {out}.[/green]")
+                else:
+                    console.log(f"[red]Rust failed for {src}: {err or f'exit status {rc}'}[/red]")
         return
 
-    console.log(f"[blue]Compiling {language} source: {source_file}[/blue]")
-    res = subprocess.run(cmd, shell=True, capture_output=True)
-    if res.returncode == 0:
+    console.log(f"[blue]Compiling {language} source: {' '.join(source_files)}[/blue]")
+    try:
+        rc = compile_batch(lang_lower, source_files, output_file)
+    except (ValueError, OSError) as e:
+        console.log(f"[red]{e}[/red]")
+        return
+    if rc == 0:
         console.log(f"[green]{language.title()} compilation successful: {output_file}.[/green]")
     else:
-        console.log(f"[red]{language.title()} failed: {res.stderr.decode()}[/red]")
+        console.log(f"[red]{language.title()} failed: exit status {rc}[/red]")
 
 @yesco.command()
 @click.argument("app_path")
 @click.argument("output_dir")
 def package(app_path, output_dir):
     console.log(f"[blue]Packaging '{app_path}'...[/blue]")
-    cmd = (
-        f"pkgbuild --root {app_path} "
-        f"--identifier com.example.myapp --version 1.0 "
-        f"--install-location /Applications {output_dir}/myapp.pkg"
-    )
-    result = subprocess.run(cmd, shell=True, capture_output=True)
-    if result.returncode == 0:
+    cmd = [
+        "pkgbuild", "--root", app_path,
+        "--identifier", "com.example.myapp", "--version", "1.0",
+        "--install-location", "/Applications", os.path.join(output_dir, "myapp.pkg")
+    ]
+    try:
+        rc = _run_streamed(cmd)
+    except OSError as e:
+        console.log(f"[red]Packaging failed: {e}[/red]")
+        return
+    if rc == 0:
         console.log(f"[green]Packaged -> {output_dir}/myapp.pkg[/green]")
     else:
-        console.log(f"[red]Packaging failed: {result.stderr.decode()}[/red]")
+        console.log(f"[red]Packaging failed: exit status {rc}[/red]")
 
 @yesco.command()
 @click.option('--retry', is_flag=True, help="Retry setup if any step fails.")
@@ -1225,104 +2628,138 @@ def setup(retry):
         # Real logic
         console.log("[green]Setup complete.[/green]")
 
-    while True:
+    max_attempts = 5
+    for attempt in range(max_attempts):
         try:
             automate_setup()
-            break
+            return
         except Exception as e:
             console.log(f"[red]Error: {e}[/red]")
-            if not retry or Prompt.ask("Retry or Exit?", choices=["Retry", "Exit"]).lower() == "exit":
+            if not retry or attempt == max_attempts - 1:
                 sys.exit(1)
-            else:
-                console.log("[yellow]Retrying setup...[/yellow]")
+            # Only ask when someone is there to answer; CI just backs off.
+            if sys.stdin.isatty() and not click.confirm("Retry?", default=False):
+                sys.exit(1)
+            console.log("[yellow]Retrying setup...[/yellow]")
+            time.sleep(0.1 * (2 ** attempt))
 
 @yesco.command()
 @click.argument("project_name")
 def run_simulator(project_name):
-    if not os.path.exists(project_name):
-        console.log(f"[red]Folder '{project_name}' not found.[/red]")
-        return
+    import subprocess
     src_folder = os.path.join(project_name, "src")
-    if not os.path.isdir(src_folder):
-        console.log(f"[red]No 'src' folder in '{project_name}'.[/red]")
+    try:
+        with os.scandir(src_folder) as it:
+            js_files = [
+                e.path for e in it
+                if e.name.endswith(".js") and e.is_file()
+            ]
+        # Directory order is filesystem-dependent; bundle in a stable order.
+        js_files.sort()
+    except (FileNotFoundError, NotADirectoryError):
+        # Only stat the project folder on the error path to pick the message.
+        if not os.path.exists(project_name):
+            console.log(f"[red]Folder '{project_name}' not found.[/red]")
+        else:
+            console.log(f"[red]No 'src' folder in '{project_name}'.[/red]")
         return
 
-    js_files = [os.path.join(src_folder, f) for f in os.listdir(src_folder) if f.endswith(".js")]
-    js_code = ""
-    for jf in js_files:
-        with open(jf, "r") as f:
-            js_code += f.read() + "\n"
-    serialized_code = base64.b64encode(js_code.encode("utf-8")).decode()
+    js_chunks = []
+    for chunk in _read_files(js_files):
+        js_chunks.extend((chunk, b"\n"))
 
+    # Joined once from the user's path; everything below is a fixed suffix.
     sim_dir = os.path.join(project_name, "simulator")
     os.makedirs(sim_dir, exist_ok=True)
-
-    html_file = os.path.join(sim_dir, "simulator.html")
-    with open(html_file, "w") as f:
-        f.write("""<!DOCTYPE html>
-<html>
-<head>
-    <title>iOS Simulator</title>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/jquery/3.6.0/jquery.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/vue/dist/vue.js"></script>
-</head>
-<body>
-  <div id="app">
-    <iframe id="ios-app-frame" src="src/main.js"></iframe>
-  </div>
-  <script> new Vue({ el: '#app' }); </script>
-</body>
-</html>""")
-
-    pkgjson = {
-        "name": f"{project_name}-simulator",
-        "version": "1.0.0",
-        "description": "Node-based iOS simulator for testing",
-        "main": "index.js",
-        "scripts": {"start": "node index.js"},
-        "author": "Your Name",
-        "license": "ISC"
-    }
-    with open(os.path.join(sim_dir, "package.json"), "w") as f:
-        f.write(json.dumps(pkgjson, indent=2))
-
-    with open(os.path.join(sim_dir, "index.js"), "w") as f:
-        f.write("""const express = require('express');
-const app = express();
-const port = 3000;
-app.use(express.static(__dirname));
-app.listen(port, () => {
-  console.log(`Server listening on port ${port}`);
-});
-""")
-
-    sim_src = os.path.join(sim_dir, "src")
+    base = sim_dir + os.sep
+
+    # Serializing escapes the name; strip its quotes to splice it in place.
+    pkg_json = _SIM_PACKAGE_JSON.replace("__PROJECT__", _json_dumps(project_name)[1:-1])
+    scaffold = dict(_SIM_TEMPLATES)
+    scaffold["package.json"] = pkg_json.encode("utf-8")
+    # Each file is written to a temp file and renamed into place, so an
+    # interrupted run never leaves a truncated scaffold behind.
+    for rel, payload in scaffold.items():
+        _write_chunks(base + rel, [payload])
+
+    sim_src = base + "src"
     os.makedirs(sim_src, exist_ok=True)
 
-    with open(os.path.join(sim_src, "main.js"), "w") as f:
-        f.write(f"""import './index.js';
-const serializedCode = '{serialized_code}';
-const decodedCode = atob(serializedCode);
-eval(decodedCode);
-""")
+    # A dev scaffold is regenerated on every run: the atomic renames keep
+    # it consistent, and it is not worth forcing to disk.
+    _write_chunks(sim_src + os.sep + "main.js", js_chunks)
 
     console.log(f"[green]Simulator setup in '{sim_dir}'.[/green]")
+    npm = shutil.which("npm") or "npm"
     try:
-        subprocess.run(f"cd {sim_dir} && npm install && npm start", shell=True, check=True)
-    except subprocess.CalledProcessError as e:
+        subprocess.run([npm, "install"], cwd=sim_dir, check=True)
+        # The server runs in its own session and outlives this command;
+        # its output goes to a log file and stop-simulator ends it by pid.
+        with open(base + "npm.log", "ab") as log:
+            proc = subprocess.Popen(
+                [npm, "start"], cwd=sim_dir, stdin=subprocess.DEVNULL,
+                stdout=log, stderr=subprocess.STDOUT, start_new_session=True
+            )
+    except (subprocess.CalledProcessError, OSError) as e:
         console.log(f"[red]Simulator failed: {e}[/red]")
+        return
+    # The start time lets stop-simulator tell the server from a later
+    # process that happens to reuse its pid.
+    started = _proc_start_time(proc.pid)
+    with open(base + _SIM_PID_FILE, "w") as f:
+        f.write(f"{proc.pid} {started}" if started else str(proc.pid))
+    console.log(f"[green]Simulator started (pid {proc.pid}); output in '{base}npm.log'.[/green]")
+
+@yesco.command()
+@click.argument("project_name")
+def stop_simulator(project_name):
+    import signal
+    pid_file = os.path.join(project_name, "simulator", _SIM_PID_FILE)
+    try:
+        with open(pid_file) as f:
+            fields = f.read().split()
+        pid = int(fields[0])
+    except (FileNotFoundError, ValueError, IndexError):
+        console.log(f"[red]No running simulator recorded for '{project_name}'.[/red]")
+        return
+    started = fields[1] if len(fields) > 1 else None
+    try:
+        if not _is_simulator_process(pid, started):
+            console.log(f"[yellow]Simulator (pid {pid}) was not running.[/yellow]")
+        else:
+            # npm start leads its own session: signal the whole group so the
+            # server it spawned goes down with it.
+            if hasattr(os, "killpg"):
+                os.killpg(pid, signal.SIGTERM)
+            else:
+                os.kill(pid, signal.SIGTERM)
+            console.log(f"[green]Simulator stopped (pid {pid}).[/green]")
+    except ProcessLookupError:
+        console.log(f"[yellow]Simulator (pid {pid}) was not running.[/yellow]")
+    except PermissionError:
+        # Not ours to signal, so not the server we started either.
+        console.log(f"[yellow]Process {pid} is not this simulator; forgetting it.[/yellow]")
+    os.unlink(pid_file)
 
 @yesco.command()
 @click.argument("project_name")
 @click.option("--language", prompt="Language (swift/objc/rust)", help="Specify language for debugging.")
 def compile_and_debug(project_name, language):
+    from rich.panel import Panel
     src_file = os.path.join(project_name, "src", "main.js")
     if not os.path.exists(src_file):
         console.log(f"[red]No source '{src_file}' found.[/red]")
         return
     try:
-        with open(src_file, "r") as f:
-            source_code = f.read()
+        with open(src_file, "rb") as f:
+            # mmap lets the kernel page the file in; it cannot map 0 bytes.
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    source_bytes = mm[:]
+            else:
+                source_bytes = b""
+        # Decoded once, for display and for the debugger.
+        source_code = source_bytes.decode("utf-8", "replace")
 
         lang_lower = language.lower()
         if lang_lower == "swift":
@@ -1344,18 +2781,19 @@ def compile_and_debug(project_name, language):
             }
             if dbg_result["status"] == "success":
                 console.log("[green]Debug success.[/green]")
-                console.print(Panel(f"**Original:**\n{source_code}\n\n**Debugged:**\n{dbg_result['code']}",
-                                    title="Generated Code"))
-                with open(src_file, "w") as wf:
-                    wf.write(dbg_result["code"])
+                console.print(_side_by_side(
+                    _GENERATED_PANEL, "Original", source_code, "Debugged", dbg_result["code"]
+                ))
+                _write_chunks(src_file, [dbg_result["code"].encode("utf-8")])
                 console.print(Panel(f"**Changes:**\n{dbg_result['changes']}",
-                                    title="Changes"))
+                                    title=_CHANGES_PANEL))
         else:
-            console.print(Panel(f"**Original:**\n{source_code}\n\n**Compiled:**\n{compiled}",
-                                title="Compiled Code"))
+            console.print(_side_by_side(
+                _COMPILED_PANEL, "Original", source_code, "Compiled", compiled
+            ))
     except Exception as e:
         console.log(f"[red]Error: {e}[/red]")
-        if Prompt.ask("Retry or Exit?", choices=["Retry", "Exit"]).lower() == "exit":
+        if not click.confirm("Retry?", default=False):
             sys.exit(1)
 
 @yesco.command()
@@ -1364,9 +2802,7 @@ def jedimt_cli(command):
     if not command:
         console.print("[red]No command for Jedimt.[/red]")
         return
-    gemini_api_key = os.environ.get("GEMINI_API_KEY")
-    jinst = Jedimt(mode="compile", gemini_api_key=gemini_api_key)
-    jinst.shell_command(list(command))
+    _get_jedimt().shell_command(command)
 
 
 # -----------------------------------------------------------------------------
@@ -1382,11 +2818,28 @@ def load_ipython_extension(ipython):
 # -----------------------------------------------------------------------------
 # 10) create_interface
 # -----------------------------------------------------------------------------
+# Live interfaces by a digest of their API key (never the key itself).
+# Showing one again redisplays the same widget tree over its existing comms
+# instead of building a new one; entries go away with the interface.
+_interfaces = weakref.WeakValueDictionary()
+
+
+def _interface_key(gemini_api_key):
+    if gemini_api_key is None:
+        return None
+    import hashlib
+    return hashlib.blake2b(gemini_api_key.encode(), digest_size=16).digest()
+
+
 def create_interface(gemini_api_key=None):
     if not ipywidgets_available:
         print("ipywidgets not installed; cannot create interface.")
         return None
-    interface = JedimtYescoInterface(gemini_api_key=gemini_api_key)
+    key = _interface_key(gemini_api_key)
+    interface = _interfaces.get(key)
+    if interface is None:
+        interface = JedimtYescoInterface(gemini_api_key=gemini_api_key)
+        _interfaces[key] = interface
     interface.display()
     return interface
 
@@ -1394,24 +2847,45 @@ def create_interface(gemini_api_key=None):
 # -----------------------------------------------------------------------------
 # 11) main()
 # -----------------------------------------------------------------------------
+def _run_yesco(args):
+    yesco(args=[a for a in args if a != "--yesco"])
+
+
+def _run_gui(_args):
+    if kivy_available:
+        _, app_cls = _kivy_classes()
+        app_cls().run()
+    else:
+        print("Kivy not installed. GUI disabled.")
+
+
+def _run_version(_args):
+    print(f"Jedimt/Yesco Version: {__version__}")
+
+
+def _run_help(_args):
+    with click.Context(yesco) as ctx:
+        click.echo(yesco.get_help(ctx))
+
+
+# Checked in order: the first flag present on the command line wins.
+_MAIN_FLAGS = {
+    "--yesco": _run_yesco,
+    "--gui": _run_gui,
+    "--version": _run_version,
+    "--help": _run_help,
+}
+
+
 def main():
-    if "--yesco" in sys.argv:
-        sys.argv.remove("--yesco")
-        yesco()
-    elif "--gui" in sys.argv:
-        if kivy_available:
-            InterfaceMapperApp().run()
-        else:
-            print("Kivy not installed. GUI disabled.")
-    elif "--version" in sys.argv:
-        console.print(f"Jedimt/Yesco Version: {__version__}")
-    elif "--help" in sys.argv:
-        with click.Context(yesco) as ctx:
-            click.echo(yesco.get_help(ctx))
-    elif len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
-        gemini_api_key = os.environ.get("GEMINI_API_KEY")
-        jinst = Jedimt(mode="compile", gemini_api_key=gemini_api_key)
-        jinst.shell_command(sys.argv[1:])
+    args = sys.argv[1:]
+    flags = set(args)
+    for flag, handler in _MAIN_FLAGS.items():
+        if flag in flags:
+            handler(args)
+            return
+    if args and not args[0].startswith("-"):
+        _get_jedimt().shell_command(args)
     else:
         console.print("No valid command. Use --yesco, --gui, --version, --help, or Jedimt commands.")
 
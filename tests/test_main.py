@@ -0,0 +1,461 @@
+import http.server
+import os
+import shutil
+import stat
+import subprocess
+import tarfile
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# The widget section is only defined in notebooks or when asked for.
+os.environ.setdefault("APTAN_ENABLE_GUI", "1")
+
+from click.testing import CliRunner
+
+import main
+
+
+@unittest.skipUnless(main.ipywidgets_available, "ipywidgets not installed")
+class ProgressTest(unittest.TestCase):
+    def setUp(self):
+        self.ui = main.JedimtYescoInterface()
+        self.addCleanup(self.ui.close)
+        self.seen = []
+        self.ui.progress.observe(lambda c: self.seen.append(c["new"]), "value")
+
+    def test_background_progress_reaches_widget(self):
+        interval = self.ui._PROGRESS_MIN_INTERVAL
+
+        def work():
+            for value in (10, 20, 30):
+                self.ui.update_progress(value)
+                time.sleep(interval * 2)
+
+        done = threading.Event()
+        self.ui._release = lambda btn: done.set()
+        self.ui._in_background(work, "Test", main.widgets.Button())
+        self.assertTrue(done.wait(5))
+        self.assertEqual(self.seen, [10, 20, 30, 0])
+
+    def test_throttle_flushes_latest_value(self):
+        self.ui.update_progress(10)
+        # Inside the interval: coalesced, and only the last one is sent.
+        self.ui.update_progress(20)
+        self.ui.update_progress(30)
+        self.assertEqual(self.ui.progress.value, 10)
+        time.sleep(self.ui._PROGRESS_MIN_INTERVAL * 4)
+        self.assertEqual(self.seen, [10, 30])
+
+
+def _baseline_generate_code(prompt, target_language, system_label):
+    """Gemini.generate_code's string building before templates were cached."""
+    if target_language == "python":
+        return (
+            "def main():\n"
+            "    # Translated code (Python)\n"
+            + "    " + "\n    ".join(prompt.splitlines()) +
+            f"\n    print('Running on {system_label}')\n\n"
+            "if __name__ == '__main__':\n"
+            "    main()\n"
+        )
+    elif target_language == "javascript":
+        return (
+            "function main() {\n"
+            "    // Translated code (JavaScript)\n"
+            + "    " + "\n    ".join(prompt.splitlines()) +
+            f"\n    console.log('Running on {system_label}');\n"
+            "}\n"
+            "main();\n"
+        )
+    elif target_language == "swift":
+        return (
+            "func main() {\n"
+            "    // Translated code (Swift)\n"
+            + "    " + "\n    ".join(prompt.splitlines()) +
+            f"\n    print(\"Running on {system_label}\")\n"
+            "}\nmain()\n"
+        )
+    return f"// Not supported: {target_language}"
+
+
+class RenderTemplateTest(unittest.TestCase):
+    PROMPTS = (
+        "", "x = 1", "a\nb\n", "a\r\nb\r\n", "a\n\n\n", "\n", "{braces} and {0}",
+    )
+
+    def test_matches_baseline(self):
+        for lang in ("python", "javascript", "swift", "cobol"):
+            for prompt in self.PROMPTS:
+                with self.subTest(lang=lang, prompt=prompt):
+                    self.assertEqual(
+                        main._render_template(prompt, lang, "Linux"),
+                        _baseline_generate_code(prompt, lang, "Linux"),
+                    )
+
+
+class CompileSourceTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def _source(self, rel, body='fn main() {}\n'):
+        path = os.path.join(self.tmp, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(body)
+        return path
+
+    def _compile(self, *args):
+        return CliRunner().invoke(
+            main.yesco, ["compile-source", *args, "--language", "rust"]
+        )
+
+    def test_duplicate_stems_are_refused(self):
+        a = self._source("a/main.rs")
+        b = self._source("b/main.rs")
+        out = os.path.join(self.tmp, "bin")
+        with self.assertRaises(ValueError):
+            main._crate_outputs((a, b), out)
+        self.assertEqual(self._compile(a, b, out).exit_code, 0)
+        self.assertFalse(os.path.exists(out))
+
+    @unittest.skipUnless(shutil.which("rustc"), "rustc not installed")
+    def test_multiple_crates_build_side_by_side(self):
+        sources = [self._source("one.rs"), self._source("src/two.rs")]
+        out = os.path.join(self.tmp, "bin")
+        self.assertEqual(self._compile(*sources, out).exit_code, 0)
+        self.assertEqual(sorted(os.listdir(out)), ["one", "two"])
+
+    def test_missing_rustc_is_reported_per_crate(self):
+        sources = [self._source("one.rs"), self._source("two.rs")]
+        out = os.path.join(self.tmp, "bin")
+        path = os.environ.get("PATH", "")
+        os.environ["PATH"] = self.tmp
+        self.addCleanup(os.environ.__setitem__, "PATH", path)
+        self.assertEqual(self._compile(*sources, out).exit_code, 0)
+        self.assertEqual(os.listdir(out), [])
+
+
+def _aptan(home):
+    """An AptAn whose sources and install index live under `home`."""
+    config = main.PlatformConfig()
+    config.home_dir = home
+    return main.AptAn(config)
+
+
+class _TempDirTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def path(self, *parts):
+        return os.path.join(self.tmp, *parts)
+
+    def write(self, rel, data=b"data"):
+        path = self.path(rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+
+class PackTreeTest(_TempDirTest):
+    def setUp(self):
+        super().setUp()
+        self.aptan = _aptan(self.path("home"))
+        self.addCleanup(self.aptan.close)
+
+    def pack(self, src):
+        tar_file = self.aptan.convert_to_targz(src, "pkg")
+        self.assertIsNotNone(tar_file)
+        tar = tarfile.open(tar_file)
+        self.addCleanup(tar.close)
+        return tar
+
+    def test_members_in_sorted_walk_order(self):
+        self.write("src/b/z.c", b"z")
+        self.write("src/a.c", b"a")
+        self.write("src/b/y.c", b"y")
+        tar = self.pack(self.path("src"))
+        self.assertEqual(tar.getnames(), ["a.c", "b/y.c", "b/z.c"])
+        self.assertEqual(tar.extractfile("b/y.c").read(), b"y")
+
+    def test_links_stay_links(self):
+        target = self.write("src/a_data", b"payload")
+        os.link(target, self.path("src", "b_hard"))
+        os.symlink("a_data", self.path("src", "c_sym"))
+        tar = self.pack(self.path("src"))
+        data, hard, sym = tar.getmembers()
+        self.assertTrue(data.isreg())
+        self.assertEqual(tar.extractfile(data).read(), b"payload")
+        self.assertTrue(hard.islnk())
+        self.assertEqual(hard.linkname, "a_data")
+        self.assertTrue(sym.issym())
+        self.assertEqual(sym.linkname, "a_data")
+
+    def test_large_file_round_trips(self):
+        payload = os.urandom(3 * 1024 * 1024 + 17)
+        self.write("src/big.bin", payload)
+        tar = self.pack(self.path("src"))
+        self.assertEqual(tar.extractfile("big.bin").read(), payload)
+
+
+class WriteChunksTest(_TempDirTest):
+    def test_replaces_contents_and_keeps_mode(self):
+        path = self.write("f.txt", b"old contents that are longer")
+        os.chmod(path, 0o600)
+        main._write_chunks(path, [b"new ", b"contents"])
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"new contents")
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o600)
+        self.assertEqual(os.listdir(self.tmp), ["f.txt"])
+
+    def test_new_file_mode(self):
+        path = self.path("new.txt")
+        main._write_chunks(path, [b"x"])
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o644)
+
+    def test_symlink_is_kept(self):
+        target = self.write("real.txt", b"old")
+        link = self.path("link.txt")
+        os.symlink("real.txt", link)
+        main._write_chunks(link, [b"new"])
+        self.assertTrue(os.path.islink(link))
+        with open(target, "rb") as f:
+            self.assertEqual(f.read(), b"new")
+
+    def test_failed_write_leaves_target_alone(self):
+        path = self.write("f.txt", b"old")
+        with mock.patch.object(main, "_writev_all", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                main._write_chunks(path, [b"new"])
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"old")
+        self.assertEqual(os.listdir(self.tmp), ["f.txt"])
+
+    @unittest.skipUnless(hasattr(os, "writev"), "no writev")
+    def test_writev_all_resumes_short_writes(self):
+        real_writev = os.writev
+
+        def short_writev(fd, buffers):
+            # At most 3 bytes per call, cutting through chunk boundaries.
+            data = b"".join(bytes(b) for b in buffers)[:3]
+            return real_writev(fd, [data])
+
+        chunks = [b"hello", b"", b" ", b"world", b"!" * 10]
+        fd, path = tempfile.mkstemp(dir=self.tmp)
+        try:
+            with mock.patch.object(main.os, "writev", short_writev):
+                main._writev_all(fd, chunks)
+        finally:
+            os.close(fd)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"".join(chunks))
+
+
+class RunCommandTest(unittest.TestCase):
+    def run_with(self, cmd, **kwargs):
+        with mock.patch("subprocess.run") as run:
+            main._run_command(cmd, **kwargs)
+        return run.call_args
+
+    def test_plain_words_run_as_argv(self):
+        call = self.run_with("make -j4 'with space'", cwd="/tmp")
+        self.assertEqual(call.args, (["make", "-j4", "with space"],))
+        self.assertEqual(call.kwargs, {"cwd": "/tmp"})
+
+    def test_shell_syntax_goes_through_shell(self):
+        for cmd in ("make | tee log", "echo $HOME", "make && make install",
+                    "ls *.c", "FOO=1 make", "cd build", "echo 'unbalanced"):
+            with self.subTest(cmd=cmd):
+                call = self.run_with(cmd, shell_executable="/bin/bash")
+                self.assertEqual(call.args, (cmd,))
+                self.assertTrue(call.kwargs["shell"])
+                self.assertEqual(call.kwargs["executable"], "/bin/bash")
+
+
+class _RangeHandler(http.server.BaseHTTPRequestHandler):
+    payload = b""
+    ranges = "honour"
+    seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        rng = self.headers.get("Range")
+        type(self).seen.append(rng)
+        if rng and self.ranges == "refuse":
+            self.send_response(416)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if rng and self.ranges == "honour":
+            start, end = (int(x) for x in rng.split("=")[1].split("-"))
+            body = self.payload[start:end + 1]
+            self.send_response(206)
+        else:
+            body = self.payload
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FetchTest(_TempDirTest):
+    def setUp(self):
+        super().setUp()
+        self.aptan = _aptan(self.path("home"))
+        self.addCleanup(self.aptan.close)
+        _RangeHandler.payload = os.urandom(10_000)
+        _RangeHandler.seen = []
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.url = f"http://127.0.0.1:{server.server_address[1]}/pkg.tar.gz"
+        patcher = mock.patch.object(main, "_RANGE_MIN_SIZE", 4096)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fetch(self, ranges):
+        _RangeHandler.ranges = ranges
+        out = self.path("out")
+        self.aptan._fetch(self.url, out)
+        with open(out, "rb") as f:
+            self.assertEqual(f.read(), _RangeHandler.payload)
+
+    def test_ranges_used_when_honoured(self):
+        self.fetch("honour")
+        self.assertEqual(len(_RangeHandler.seen), 1 + main._RANGE_PARTS)
+
+    def test_falls_back_when_ranges_ignored(self):
+        self.fetch("ignore")
+        # Ranged GETs answered with 200 are abandoned for one plain stream.
+        self.assertIsNone(_RangeHandler.seen[0])
+        self.assertTrue(any(_RangeHandler.seen[1:]))
+
+    def test_falls_back_when_ranges_refused(self):
+        self.fetch("refuse")
+
+    def test_small_files_are_not_split(self):
+        _RangeHandler.payload = b"x" * 100
+        self.fetch("honour")
+        self.assertEqual(_RangeHandler.seen, [None])
+
+
+class InstallIndexTest(_TempDirTest):
+    def setUp(self):
+        super().setUp()
+        self.aptan = _aptan(self.path("home"))
+        self.addCleanup(self.aptan.close)
+
+    def test_record_and_list(self):
+        self.assertEqual(self.aptan.list_installed(), [])
+        self.aptan._record_installs([
+            ("zlib", 2.0, "Linux", "/opt/zlib"),
+            ("abc", 1.0, "Linux", "/opt/abc"),
+        ])
+        self.aptan._record_installs([("zlib", 3.0, "Linux", "/opt/zlib2")])
+        self.assertEqual(self.aptan.list_installed(), [
+            ("abc", 1.0, "Linux", "/opt/abc"),
+            ("zlib", 3.0, "Linux", "/opt/zlib2"),
+        ])
+
+    def test_failed_batch_is_rolled_back(self):
+        self.aptan._record_installs([("abc", 1.0, "Linux", "/opt/abc")])
+        with self.assertRaises(Exception):
+            self.aptan._record_installs([("new", 1.0, "Linux", "/x"), ("short",)])
+        self.assertEqual([r[0] for r in self.aptan.list_installed()], ["abc"])
+
+    def test_index_survives_reopen(self):
+        self.aptan._record_installs([("abc", 1.0, "Linux", "/opt/abc")])
+        self.aptan.close()
+        again = _aptan(self.path("home"))
+        self.addCleanup(again.close)
+        self.assertEqual(again.list_installed(), [("abc", 1.0, "Linux", "/opt/abc")])
+
+
+@unittest.skipUnless(shutil.which("make"), "make not installed")
+class BuildNativeBatchTest(_TempDirTest):
+    def setUp(self):
+        super().setUp()
+        self.aptan = _aptan(self.path("home"))
+        self.addCleanup(self.aptan.close)
+
+    def package(self, name, recipe):
+        d = self.path(name)
+        os.makedirs(d)
+        if recipe is not None:
+            with open(os.path.join(d, "Makefile"), "w") as f:
+                f.write(f"all:\n\t{recipe}\n")
+        return d
+
+    def test_failures_are_reported_per_directory(self):
+        good = self.package("good", "touch built")
+        bad = self.package("bad one", "exit 1")
+        also_good = self.package("also", "touch built")
+        bare = self.package("bare", None)
+        results = self.aptan.build_native_batch([
+            ("good", good), ("bad", bad), ("also", also_good), ("bare", bare),
+        ])
+        self.assertEqual(results, {good: True, bad: False, also_good: True, bare: False})
+        self.assertTrue(os.path.exists(os.path.join(good, "built")))
+        self.assertTrue(os.path.exists(os.path.join(also_good, "built")))
+
+
+@unittest.skipUnless(os.path.exists("/proc/self/stat"), "needs /proc")
+class StopSimulatorTest(_TempDirTest):
+    def pid_file(self, contents):
+        path = self.write(os.path.join("proj", "simulator", main._SIM_PID_FILE),
+                          contents.encode())
+        return path
+
+    def stop(self):
+        result = CliRunner().invoke(main.yesco, ["stop-simulator", self.path("proj")])
+        self.assertEqual(result.exit_code, 0, result.output)
+
+    def test_stops_the_recorded_server(self):
+        proc = subprocess.Popen(["sleep", "30"], start_new_session=True)
+        self.addCleanup(proc.kill)
+        path = self.pid_file(f"{proc.pid} {main._proc_start_time(proc.pid)}")
+        self.stop()
+        self.assertEqual(proc.wait(5), -15)
+        self.assertFalse(os.path.exists(path))
+
+    def test_reused_pid_is_left_alone(self):
+        proc = subprocess.Popen(["sleep", "30"], start_new_session=True)
+        self.addCleanup(proc.wait)
+        self.addCleanup(proc.kill)
+        path = self.pid_file(f"{proc.pid} 1")
+        self.stop()
+        self.assertIsNone(proc.poll())
+        self.assertFalse(os.path.exists(path))
+
+    def test_non_leader_is_left_alone(self):
+        # Our own pid: alive, but not the leader of its own process group.
+        if os.getpgid(0) == os.getpid():
+            self.skipTest("test runner leads its own process group")
+        path = self.pid_file(str(os.getpid()))
+        self.stop()
+        self.assertFalse(os.path.exists(path))
+
+    def test_exited_server(self):
+        proc = subprocess.Popen(["true"], start_new_session=True)
+        proc.wait()
+        path = self.pid_file(f"{proc.pid} {main._proc_start_time(os.getpid())}")
+        self.stop()
+        self.assertFalse(os.path.exists(path))
+
+    def test_unreadable_pid_file(self):
+        path = self.pid_file("not a pid")
+        self.stop()
+        self.assertTrue(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()